@@ -1,31 +1,45 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
+import io
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
-from urllib.parse import urlparse
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+import ijson
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from sqlalchemy import bindparam, delete, func, select, text, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 try:  # pragma: no cover - allow execution as module or script
     from .sql_alchemy import (  # type: ignore[attr-defined]
         Category,
         DataTable,
         Dimension,
+        IngestCheckpoint,
         Observation,
         ObservationDimensionValue,
         SessionLocal,
+        init_db,
     )
 except ImportError:  # pragma: no cover
     from sql_alchemy import (
         Category,
         DataTable,
         Dimension,
+        IngestCheckpoint,
         Observation,
         ObservationDimensionValue,
         SessionLocal,
+        init_db,
     )
 
 LOGGER = logging.getLogger(__name__)
@@ -35,7 +49,29 @@ logging.basicConfig(
 )
 
 DEFAULT_TIMEOUT = 60
+HTTP_POOL_SIZE = 20
+FETCH_WORKERS = 8
+OBSERVATION_BATCH_SIZE = 10_000
 LANG_PRIORITY = ("en", "fr", "de", "lb")
+_DATASET_CODE_RE = re.compile(r"/data/([^/]+)/")
+CACHE_DIR = Path(__file__).resolve().parent / "cache"
+
+# (dimension_id, category_id) links and time period resolved from an observation key.
+ResolvedKey = Tuple[Sequence[Tuple[int, int]], Optional[str]]
+
+# Retry throttling and transient server errors with backoff instead of failing
+# the dataset; requests already negotiates gzip and keeps connections alive.
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+)
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=HTTP_RETRY),
+)
 
 
 def _prefer_text(source: Optional[dict], fallback: Optional[str] = None) -> Optional[str]:
@@ -53,8 +89,7 @@ def _prefer_text(source: Optional[dict], fallback: Optional[str] = None) -> Opti
 
 def _extract_dataset_code(url: str) -> str:
     """Infer the dataset code from the SDMX data URL."""
-    parsed = urlparse(url)
-    match = re.search(r"/data/([^/]+)/", parsed.path)
+    match = _DATASET_CODE_RE.search(url)
     if not match:
         raise ValueError(f"Cannot infer dataset code from URL: {url}")
     parts = match.group(1).split(",")
@@ -63,15 +98,67 @@ def _extract_dataset_code(url: str) -> str:
     return parts[1]
 
 
-def fetch_dataset_payload(url: str) -> dict:
-    """Retrieve the SDMX-JSON payload for the provided dataset URL."""
+def _cache_paths(url: str) -> Tuple[Path, Path]:
+    """Return the cached body and sidecar metadata paths for a dataset URL."""
+    key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{key}.json.gz", CACHE_DIR / f"{key}.meta.json"
+
+
+def _store_cached_payload(url: str, response: requests.Response) -> None:
+    """Persist a response body alongside its validators for conditional requests."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    body_path, meta_path = _cache_paths(url)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    body_path.write_bytes(gzip.compress(response.content))
+    meta_path.write_bytes(
+        orjson.dumps({"url": url, "etag": etag, "last_modified": last_modified})
+    )
+
+
+def fetch_dataset_payload(url: str) -> bytes:
+    """Retrieve the raw SDMX-JSON payload for the provided dataset URL.
+
+    The body is returned undecoded; ``store_metadata`` and ``store_observations``
+    stream the parts they need out of it so the full document is never
+    materialised as Python objects.
+
+    Responses carrying an ``ETag`` or ``Last-Modified`` header are cached on disk,
+    and later runs revalidate them with a conditional GET so an unchanged dataset
+    is read back from the cache instead of being downloaded again.
+    """
     LOGGER.info("Fetching dataset JSON from %s", url)
-    response = requests.get(url, timeout=DEFAULT_TIMEOUT)
-    response.raise_for_status()
-    payload = response.json()
-    if "data" not in payload:
-        raise ValueError("Payload does not contain 'data' section.")
-    return payload
+    body_path, meta_path = _cache_paths(url)
+    headers: Dict[str, str] = {}
+    if body_path.exists() and meta_path.exists():
+        meta = orjson.loads(meta_path.read_bytes())
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = HTTP_SESSION.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+    if response.status_code == 304 and headers:
+        LOGGER.info("Dataset unchanged since last fetch, using cached payload for %s", url)
+        content = gzip.decompress(body_path.read_bytes())
+    else:
+        response.raise_for_status()
+        content = response.content
+        _store_cached_payload(url, response)
+    return content
+
+
+def _load_structure(payload: bytes) -> dict:
+    """Stream-parse the first structure definition out of a dataset payload."""
+    structure = next(
+        ijson.items(io.BytesIO(payload), "data.structures.item", use_float=True),
+        None,
+    )
+    if not structure:
+        raise ValueError("Dataset payload does not include any structure definition.")
+    return structure
 
 
 def _build_dimension_metadata(structure: dict) -> List[dict]:
@@ -123,21 +210,16 @@ def _build_dimension_metadata(structure: dict) -> List[dict]:
 def store_metadata(
     session: Session,
     dataset_code: str,
-    payload: dict,
+    payload: bytes,
 ) -> Tuple[
     DataTable,
     Dict[str, Dimension],
     Dict[str, Dict[str, Category]],
     List[str],
-    Dict[str, List[str]],
+    Dict[str, np.ndarray],
 ]:
     """Create (or reuse) the dataset, dimensions, and categories described in the payload."""
-    data_section = payload.get("data", {})
-    structures = data_section.get("structures") or []
-    if not structures:
-        raise ValueError("Dataset payload does not include any structure definition.")
-
-    structure = structures[0]
+    structure = _load_structure(payload)
     dataset_name = structure.get("name") or dataset_code
     dataset_name = str(_prefer_text(structure.get("names"), dataset_name))
     dataset_description = _prefer_text(structure.get("descriptions"), structure.get("description"))
@@ -150,6 +232,9 @@ def store_metadata(
     if datatable:
         datatable.name = dataset_name
         datatable.description = dataset_description
+        # Bump even when name/description are unchanged: the API keys caches on version.
+        datatable.updated_at = func.now()
+        datatable.version = DataTable.version + 1
     else:
         datatable = DataTable(
             code=dataset_code,
@@ -162,11 +247,24 @@ def store_metadata(
     dimension_lookup: Dict[str, Dimension] = {}
     category_lookup: Dict[str, Dict[str, Category]] = {}
     dimension_order: List[str] = []
-    dimension_value_codes: Dict[str, List[str]] = {}
+    dimension_value_codes: Dict[str, np.ndarray] = {}
     pending_parents: List[Tuple[str, Category, str]] = []
 
     dimensions_meta = _build_dimension_metadata(structure)
 
+    existing_dimensions: Dict[str, Dimension] = {
+        dimension.code: dimension
+        for dimension in session.query(Dimension).filter(
+            Dimension.data_table_id == datatable.id
+        )
+    }
+    existing_categories: Dict[Tuple[int, str], Category] = {
+        (category.dimension_id, category.code): category
+        for category in session.query(Category).filter(
+            Category.data_table_id == datatable.id
+        )
+    }
+
     new_dim_count = 0
     new_cat_count = 0
 
@@ -174,14 +272,7 @@ def store_metadata(
         dim_code = meta["code"]
         dim_label = meta["label"]
 
-        existing_dimension = (
-            session.query(Dimension)
-            .filter(
-                Dimension.data_table_id == datatable.id,
-                Dimension.code == dim_code,
-            )
-            .one_or_none()
-        )
+        existing_dimension = existing_dimensions.get(dim_code)
 
         if existing_dimension:
             dimension = existing_dimension
@@ -191,29 +282,21 @@ def store_metadata(
                 name=dim_label,
                 label=dim_label,
                 position=meta["position"],
-                data_table=datatable,
+                data_table_id=datatable.id,
             )
             session.add(dimension)
-            session.flush()
             new_dim_count += 1
 
         dimension_lookup[dim_code] = dimension
         dimension_order.append(dim_code)
         category_lookup[dim_code] = {}
-        value_codes: List[str] = []
+        value_codes = np.empty(len(meta["values"]), dtype=object)
 
-        for value_meta in meta["values"]:
+        for value_index, value_meta in enumerate(meta["values"]):
             category_code = value_meta["code"]
             category_label = value_meta["label"] or category_code
 
-            existing_category = (
-                session.query(Category)
-                .filter(
-                    Category.dimension_id == dimension.id,
-                    Category.code == category_code,
-                )
-                .one_or_none()
-            )
+            existing_category = existing_categories.get((dimension.id, category_code))
             if existing_category:
                 category = existing_category
                 category.name = category_label
@@ -223,14 +306,14 @@ def store_metadata(
                     code=category_code,
                     name=category_label,
                     label=category_label,
-                    data_table=datatable,
+                    data_table_id=datatable.id,
                     dimension=dimension,
                 )
                 session.add(category)
                 new_cat_count += 1
 
             category_lookup[dim_code][category_code] = category
-            value_codes.append(category_code)
+            value_codes[value_index] = category_code
 
             parent_code = value_meta.get("parent_code")
             if parent_code:
@@ -238,21 +321,28 @@ def store_metadata(
 
         dimension_value_codes[dim_code] = value_codes
 
+    # Insert categories first, then link parents in one executemany UPDATE;
+    # assigning category.parent makes the flush sort the self-referential rows
+    # one by one and then update any changed parents row by row.
+    session.flush()
+
+    parent_rows: List[dict] = []
     for dim_code, category, parent_code in pending_parents:
-        parent = category_lookup.get(dim_code, {}).get(parent_code)
+        parent = category_lookup[dim_code].get(parent_code)
         if parent is None:
-            parent = (
-                session.query(Category)
-                .filter(
-                    Category.dimension_id == dimension_lookup[dim_code].id,
-                    Category.code == parent_code,
-                )
-                .one_or_none()
-            )
-        if parent is not None:
-            category.parent = parent
-
-    session.flush()
+            # Parents outside the payload's codelist may still exist from an
+            # earlier ingest; they were already loaded with the prefetch above.
+            parent = existing_categories.get((dimension_lookup[dim_code].id, parent_code))
+        if parent is not None and category.parent_id != parent.id:
+            parent_rows.append({"category_id": category.id, "parent_id": parent.id})
+            set_committed_value(category, "parent_id", parent.id)
+    if parent_rows:
+        session.execute(
+            update(Category.__table__)
+            .where(Category.__table__.c.id == bindparam("category_id"))
+            .values(parent_id=bindparam("parent_id")),
+            parent_rows,
+        )
 
     LOGGER.info(
         "Dataset %s - dimensions: %d (%d new), categories: %d (%d new)",
@@ -279,8 +369,13 @@ def ensure_category(
     category_lookup: Dict[str, Dict[str, Category]],
     dim_code: str,
     category_code: str,
+    flush: bool = True,
 ) -> Category:
-    """Safely resolve or create a category for the provided dimension."""
+    """Safely resolve or create a category for the provided dimension.
+
+    Pass ``flush=False`` when resolving many categories at once and flush the
+    session after the batch; the new category has no id until then.
+    """
     cat_map = category_lookup.setdefault(dim_code, {})
     category = cat_map.get(category_code)
     if category:
@@ -290,106 +385,265 @@ def ensure_category(
         code=category_code,
         name=category_code,
         label=category_code,
-        data_table=datatable,
+        data_table_id=datatable.id,
         dimension=dimension,
     )
     session.add(category)
-    session.flush()
+    if flush:
+        session.flush()
     cat_map[category_code] = category
     return category
 
 
+def _insert_observation_batch(
+    session: Session,
+    observation_rows: List[dict],
+    observation_links: List[Sequence[Tuple[int, int]]],
+) -> None:
+    """Bulk insert a batch of observations and their dimension/category links."""
+    # Assign ids up front so the batch goes out as one executemany: SQLite cannot
+    # return ids in parameter order for a multi-row INSERT, so RETURNING would
+    # degrade to a statement per row. The ingest transaction already holds the
+    # write lock (store_metadata has written the datatable row), so no other
+    # writer can take ids from this range.
+    first_id = session.execute(select(func.coalesce(func.max(Observation.id), 0))).scalar_one() + 1
+    observation_ids = range(first_id, first_id + len(observation_rows))
+    for observation_id, row in zip(observation_ids, observation_rows):
+        row["id"] = observation_id
+    session.execute(Observation.__table__.insert(), observation_rows)
+    link_rows = [
+        {
+            "observation_id": observation_id,
+            "dimension_id": dimension_id,
+            "category_id": category_id,
+        }
+        for observation_id, links in zip(observation_ids, observation_links)
+        for dimension_id, category_id in links
+    ]
+    # The link table has no relationships to cascade, so skip the ORM bulk path
+    # and hand the rows straight to a Core executemany.
+    if link_rows:
+        session.execute(ObservationDimensionValue.__table__.insert(), link_rows)
+
+
+def _delete_observations(session: Session, datatable_id: int) -> None:
+    """Remove a dataset's observations and their dimension/category links."""
+    observation_ids = select(Observation.__table__.c.id).where(
+        Observation.__table__.c.data_table_id == datatable_id
+    )
+    # Foreign keys are not enforced, so clear the links explicitly first.
+    session.execute(
+        delete(ObservationDimensionValue.__table__).where(
+            ObservationDimensionValue.__table__.c.observation_id.in_(observation_ids)
+        )
+    )
+    session.execute(
+        delete(Observation.__table__).where(Observation.__table__.c.data_table_id == datatable_id)
+    )
+
+
+def _normalise_observation_key(key: str, expected_len: int, dataset_code: str) -> str:
+    """Pad or truncate a malformed observation key and zero non-integer indices."""
+    indices = key.split(":")
+    if len(indices) != expected_len:
+        LOGGER.warning(
+            "Observation key length mismatch for dataset %s: got %d, expected %d",
+            dataset_code,
+            len(indices),
+            expected_len,
+        )
+        if len(indices) < expected_len:
+            indices = indices + ["0"] * (expected_len - len(indices))
+        else:
+            indices = indices[:expected_len]
+    normalised: List[str] = []
+    for index_str in indices:
+        try:
+            normalised.append(str(int(index_str)))
+        except ValueError:
+            normalised.append("0")
+    return ":".join(normalised)
+
+
+def _parse_key_matrix(keys: Sequence[str], expected_len: int, dataset_code: str) -> np.ndarray:
+    """Parse observation keys such as ``"0:3:1"`` into an ``(n_obs, n_dims)`` index matrix.
+
+    Malformed keys (wrong length or non-integer indices) are normalised with
+    ``_normalise_observation_key`` so every key still yields one row.
+    """
+    try:
+        matrix = np.array([key.split(":") for key in keys], dtype=np.int64)
+    except (ValueError, OverflowError):
+        matrix = None
+    if matrix is None or matrix.shape != (len(keys), expected_len):
+        matrix = np.array(
+            [
+                _normalise_observation_key(key, expected_len, dataset_code).split(":")
+                for key in keys
+            ],
+            dtype=np.int64,
+        )
+    return matrix
+
+
+def _resolve_keys(
+    keys: Sequence[str],
+    link_tables: Sequence[List[Tuple[int, int]]],
+    time_position: Optional[int],
+    time_codes: Optional[np.ndarray],
+    dataset_code: str,
+) -> List[Optional[ResolvedKey]]:
+    """Resolve a chunk of observation keys to their links and time periods.
+
+    Each position's ``(dimension_id, category_id)`` table is gathered with fancy
+    indexing over the key matrix; positions without any values are left out of
+    the links. Keys with an out-of-range index resolve to ``None``.
+    """
+    expected_len = len(link_tables)
+    if not expected_len:
+        return [((), None)] * len(keys)
+    if not keys:
+        return []
+    matrix = _parse_key_matrix(keys, expected_len, dataset_code)
+
+    valid = np.ones(len(keys), dtype=bool)
+    for position, table in enumerate(link_tables):
+        if table:
+            column = matrix[:, position]
+            valid &= (column < len(table)) & (column >= -len(table))
+
+    def gather(position: int, lookup: np.ndarray) -> np.ndarray:
+        return lookup[np.where(valid, matrix[:, position], 0)]
+
+    populated = [position for position, table in enumerate(link_tables) if table]
+    links = np.empty((len(keys), len(populated)), dtype=object)
+    for column_index, position in enumerate(populated):
+        table = link_tables[position]
+        links[:, column_index] = gather(
+            position, np.fromiter(table, dtype=object, count=len(table))
+        )
+    if time_position is not None and time_codes is not None and len(time_codes):
+        time_periods: List[Optional[str]] = gather(time_position, time_codes).tolist()
+    else:
+        time_periods = [None] * len(keys)
+
+    return [
+        (row_links, time_period) if is_valid else None
+        for row_links, time_period, is_valid in zip(
+            links.tolist(), time_periods, valid.tolist()
+        )
+    ]
+
+
+def _iter_observation_chunks(
+    payload: bytes,
+) -> Iterator[Tuple[List[Tuple[str, float]], int]]:
+    """Stream ``(key, value)`` observation entries out of the payload in chunks.
+
+    Yields lists of at most ``OBSERVATION_BATCH_SIZE`` entries, each with the
+    number of observations skipped in that chunk because they carry no value.
+    """
+    entries: List[Tuple[str, float]] = []
+    skipped = 0
+    for key, row in ijson.kvitems(
+        io.BytesIO(payload), "data.dataSets.item.observations", use_float=True
+    ):
+        if not row or row[0] is None:
+            skipped += 1
+            continue
+        entries.append((key, row[0]))
+        if len(entries) >= OBSERVATION_BATCH_SIZE:
+            yield entries, skipped
+            entries, skipped = [], 0
+    if entries or skipped:
+        yield entries, skipped
+
+
 def store_observations(
     session: Session,
     datatable: DataTable,
     dimension_lookup: Dict[str, Dimension],
     category_lookup: Dict[str, Dict[str, Category]],
     dimension_order: Sequence[str],
-    dimension_value_codes: Dict[str, List[str]],
-    payload: dict,
+    dimension_value_codes: Dict[str, np.ndarray],
+    payload: bytes,
 ) -> None:
-    """Persist all observations contained in the dataset payload."""
-    datasets = payload.get("data", {}).get("dataSets") or []
-    if not datasets:
-        LOGGER.warning("Dataset %s has no dataSets section.", datatable.code)
-        return
+    """Persist all observations contained in the dataset payload.
 
-    observations = datasets[0].get("observations") or {}
-    if not observations:
-        LOGGER.warning("Dataset %s has no observation entries.", datatable.code)
-        return
+    The payload is a full snapshot of the dataset, so observations from an
+    earlier ingest are replaced rather than appended to.
+    """
+    _delete_observations(session, datatable.id)
 
     total = 0
     skipped_missing_category = 0
     skipped_missing_value = 0
 
-    expected_len = len(dimension_order)
-
-    for key, row in observations.items():
-        if not row:
-            skipped_missing_value += 1
-            continue
-        raw_value = row[0]
-        if raw_value is None:
-            skipped_missing_value += 1
-            continue
-
-        indices = key.split(":")
-        if len(indices) != expected_len:
-            LOGGER.warning(
-                "Observation key length mismatch for dataset %s: got %d, expected %d",
-                datatable.code,
-                len(indices),
-                expected_len,
-            )
-            if len(indices) < expected_len:
-                indices = indices + ["0"] * (expected_len - len(indices))
-            else:
-                indices = indices[:expected_len]
-
-        dims_map: Dict[str, str] = {}
-        for position, index_str in enumerate(indices):
-            dim_code = dimension_order[position]
-            value_list = dimension_value_codes.get(dim_code, [])
-            try:
-                index_int = int(index_str)
-            except ValueError:
-                index_int = 0
-            if not value_list:
-                continue
-            if index_int >= len(value_list):
-                skipped_missing_category += 1
-                break
-            dims_map[dim_code] = value_list[index_int]
-        else:
-            observation = Observation(
-                value=float(raw_value),
-                time_period=dims_map.get("TIME_PERIOD"),
-                data_table=datatable,
-            )
-            session.add(observation)
-            session.flush()
-
-            for dim_code, category_code in dims_map.items():
-                dimension = dimension_lookup[dim_code]
-                category = category_lookup.get(dim_code, {}).get(category_code)
-                if category is None:
-                    category = ensure_category(
+    position_categories: List[Tuple[Dimension, List[Category]]] = []
+    for dim_code in dimension_order:
+        dimension = dimension_lookup[dim_code]
+        position_categories.append(
+            (
+                dimension,
+                [
+                    ensure_category(
                         session,
                         datatable,
                         dimension,
                         category_lookup,
                         dim_code,
                         category_code,
+                        flush=False,
                     )
-                session.add(
-                    ObservationDimensionValue(
-                        observation=observation,
-                        dimension=dimension,
-                        category=category,
-                    )
-                )
-            total += 1
+                    for category_code in dimension_value_codes.get(dim_code, [])
+                ],
+            )
+        )
+    session.flush()
+
+    # Per-position (dimension_id, category_id) link tables, indexed by the
+    # integers that make up the observation keys.
+    link_tables: List[List[Tuple[int, int]]] = [
+        [(dimension.id, category.id) for category in categories]
+        for dimension, categories in position_categories
+    ]
+    time_position = (
+        dimension_order.index("TIME_PERIOD") if "TIME_PERIOD" in dimension_order else None
+    )
+    time_codes = (
+        dimension_value_codes.get("TIME_PERIOD") if time_position is not None else None
+    )
+
+    for entries, skipped in _iter_observation_chunks(payload):
+        skipped_missing_value += skipped
+        keys = [key for key, _ in entries]
+
+        resolved_keys = _resolve_keys(
+            keys, link_tables, time_position, time_codes, datatable.code
+        )
+
+        observation_rows: List[dict] = []
+        observation_links: List[Sequence[Tuple[int, int]]] = []
+        for (_, raw_value), resolved in zip(entries, resolved_keys):
+            if resolved is None:
+                skipped_missing_category += 1
+                continue
+            links, time_period = resolved
+            observation_rows.append(
+                {
+                    "value": float(raw_value),
+                    "time_period": time_period,
+                    "data_table_id": datatable.id,
+                }
+            )
+            observation_links.append(links)
+        if observation_rows:
+            _insert_observation_batch(session, observation_rows, observation_links)
+        total += len(observation_rows)
+
+    if not (total or skipped_missing_value or skipped_missing_category):
+        LOGGER.warning("Dataset %s has no observation entries.", datatable.code)
+        return
 
     session.flush()
     LOGGER.info(
@@ -419,33 +673,65 @@ def load_urls_from_file(file_path: str) -> List[str]:
 
 
 def fetch_data_recurrently(dataset_urls: Sequence[str]) -> None:
-    """Fetch data for all provided dataset URLs."""
-    for url in dataset_urls:
-        dataset_code = _extract_dataset_code(url)
-        LOGGER.info("Processing dataset %s", dataset_code)
-        try:
-            payload = fetch_dataset_payload(url)
-            with SessionLocal() as session:
-                datatable, dimension_lookup, category_lookup, dimension_order, dimension_value_codes = store_metadata(
-                    session,
-                    dataset_code,
-                    payload,
-                )
-                store_observations(
-                    session,
-                    datatable,
-                    dimension_lookup,
-                    category_lookup,
-                    dimension_order,
-                    dimension_value_codes,
-                    payload,
-                )
-                session.commit()
-        except Exception as exc:  # pragma: no cover - defensive logging
-            LOGGER.exception("Failed to process dataset %s: %s", dataset_code, exc)
+    """Fetch data for all provided dataset URLs.
+
+    Downloads run concurrently on a thread pool; payloads are ingested one at a
+    time as they complete because SQLite only supports a single writer.
+    """
+    ingested = 0
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = {
+            executor.submit(fetch_dataset_payload, url): _extract_dataset_code(url)
+            for url in dataset_urls
+        }
+        for future in as_completed(futures):
+            dataset_code = futures.pop(future)
+            LOGGER.info("Processing dataset %s", dataset_code)
+            try:
+                payload = future.result()
+                payload_hash = hashlib.blake2b(payload).hexdigest()
+                # One transaction per dataset, taking SQLite's write lock up front so
+                # the first flush never has to upgrade a shared lock (SQLITE_BUSY).
+                with SessionLocal() as session, session.begin():
+                    session.execute(text("BEGIN IMMEDIATE"))
+                    checkpoint = session.get(IngestCheckpoint, dataset_code)
+                    if checkpoint is not None and checkpoint.payload_hash == payload_hash:
+                        LOGGER.info("Dataset %s unchanged since last ingest; skipping.", dataset_code)
+                        continue
+                    datatable, dimension_lookup, category_lookup, dimension_order, dimension_value_codes = store_metadata(
+                        session,
+                        dataset_code,
+                        payload,
+                    )
+                    store_observations(
+                        session,
+                        datatable,
+                        dimension_lookup,
+                        category_lookup,
+                        dimension_order,
+                        dimension_value_codes,
+                        payload,
+                    )
+                    if checkpoint is None:
+                        session.add(
+                            IngestCheckpoint(dataset_code=dataset_code, payload_hash=payload_hash)
+                        )
+                    else:
+                        checkpoint.payload_hash = payload_hash
+                ingested += 1
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.exception("Failed to process dataset %s: %s", dataset_code, exc)
+
+    if ingested:
+        # Refresh planner statistics once per run so SQLite picks between the
+        # link-table indexes on real row counts rather than defaults.
+        with SessionLocal() as session:
+            session.execute(text("ANALYZE"))
+            session.commit()
 
 
 def main() -> None:
+    init_db()
     script_dir = Path(__file__).resolve().parent
     urls_file = script_dir / "database" / "LustatCensus.txt"
     try:
@@ -2,15 +2,21 @@
 # import sys
 # sys.path.append("/Path/to/directory/agentic-framework") # Replace with your directory path
 
+import hashlib
 import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from besser.agent.core.agent import Agent
 from besser.agent.core.session import Session
 from besser.agent.exceptions.logger import logger
 
 from besser.agent.nlp.llm.llm_openai_api import LLMOpenAI
-from observationchecker import fetch_all_datatables, get_datatable_id_by_name, get_dimensions_by_datatable_id, get_dimension_ids_by_names, get_observation_values, get_observation_ids_by_dimension
+from observationchecker import fetch_all_datatables, get_datatable_names, get_datatable_id_by_name, get_dimensions_by_datatable_id, get_dimension_ids_by_names, get_observation_values, get_observation_ids_by_dimension, init_db, session_scope
 
 # Configure the logging module (optional
 logger.setLevel(logging.INFO)
@@ -67,23 +73,104 @@ initial_state.set_body(init_body)
 base_state.set_body(base_body)
 
 
+# LLM answers keyed by (normalised user message, digest of the prompt context)
+PREDICTION_CACHE_SIZE = 1024
+prediction_cache: "OrderedDict[tuple, str]" = OrderedDict()
+prediction_cache_lock = threading.Lock()
+
+
+def cached_predict(prompt: str, message: str, context: str) -> str:
+    """Return gpt.predict(prompt), reusing earlier answers for the same message and context."""
+    normalised_message = " ".join(message.lower().split())
+    context_digest = hashlib.blake2b(context.encode("utf-8"), digest_size=16).hexdigest()
+    key = (normalised_message, context_digest)
+    with prediction_cache_lock:
+        if key in prediction_cache:
+            prediction_cache.move_to_end(key)
+            return prediction_cache[key]
+    answer = gpt.predict(prompt)
+    with prediction_cache_lock:
+        prediction_cache[key] = answer
+        if len(prediction_cache) > PREDICTION_CACHE_SIZE:
+            prediction_cache.popitem(last=False)
+    return answer
+
+
+# Datatable listing and names reused across turns for DATATABLES_CACHE_TTL seconds
+DATATABLES_CACHE_TTL = 60
+datatables_cache: Optional[Tuple[float, str, List[str]]] = None
+
+
+def cached_datatables() -> Tuple[str, List[str]]:
+    """Return the datatable listing and names, refreshing them at most once per TTL window."""
+    global datatables_cache
+    now = time.monotonic()
+    if datatables_cache is None or now - datatables_cache[0] >= DATATABLES_CACHE_TTL:
+        with session_scope() as db:
+            datatables_cache = (now, fetch_all_datatables(db), get_datatable_names(db))
+    return datatables_cache[1], datatables_cache[2]
+
+
+# Dimension listings per datatable, expired on the same TTL so a re-ingest shows up together
+dimensions_cache: Dict[int, Tuple[float, str]] = {}
+
+
+def cached_dimensions(datatable_id: int) -> str:
+    """Return get_dimensions_by_datatable_id(), refreshing it at most once per TTL window."""
+    now = time.monotonic()
+    entry = dimensions_cache.get(datatable_id)
+    if entry is None or now - entry[0] >= DATATABLES_CACHE_TTL:
+        entry = (now, get_dimensions_by_datatable_id(datatable_id))
+        dimensions_cache[datatable_id] = entry
+    return entry[1]
+
+
+def direct_match(message: str, names: List[str]) -> Optional[str]:
+    """Return the only name quoted in the message as whole words (case-insensitive).
+
+    Returns None when no name or several names match, so the caller asks the LLM;
+    a name appearing only inside a longer word ("Sex" in "Essex") does not count.
+    """
+    matches = {
+        name
+        for name in names
+        if name and re.search(r"(?<!\w)" + re.escape(name) + r"(?!\w)", message, re.IGNORECASE)
+    }
+    if len(matches) == 1:
+        return matches.pop()
+    return None
+
+
+def dimension_names(dimensions: str) -> List[str]:
+    """Extract the dimension names from a get_dimensions_by_datatable_id() listing."""
+    parsed = json.loads(dimensions)
+    if not isinstance(parsed, list):
+        return []
+    return [dimension["name"] for dimension in parsed]
+
+
 def question_body(session: Session):
-    datatable = fetch_all_datatables()
+    datatable, datatable_names = cached_datatables()
     message = session.event.message
-    prompt = f"Given the user's request: '{message}', which datatable fits the most? Decide using this description of the databases and only answer with the name of the database: \n{datatable}"
-    request1 = gpt.predict(prompt)
+    # Skip the LLM when the message names exactly one datatable
+    request1 = direct_match(message, datatable_names)
+    if request1 is None:
+        prompt = f"Given the user's request: '{message}', which datatable fits the most? Decide using this description of the databases and only answer with the name of the database: \n{datatable}"
+        request1 = cached_predict(prompt, message, datatable)
     print(request1)
 
     id = get_datatable_id_by_name(request1)
     
 
     
-    dimensions = get_dimensions_by_datatable_id(id)
+    dimensions = cached_dimensions(id)
     print(dimensions)
-    prompt2 = f"Given the user's request: '{message}', and the following dimensions: {dimensions}, return the dimension that could be relevant to the user's query. Answer only with the name of the most fitting dimension."
-    request2 = gpt.predict(prompt2)
+    request2 = direct_match(message, dimension_names(dimensions))
+    if request2 is None:
+        prompt2 = f"Given the user's request: '{message}', and the following dimensions: {dimensions}, return the dimension that could be relevant to the user's query. Answer only with the name of the most fitting dimension."
+        request2 = cached_predict(prompt2, message, dimensions)
+        print(prompt2)
     print(request2)
-    print(prompt2)
     response = {"dataset_name": request1, "dimension_name": request2, "message": f"I selected the most fitting dataset and dimension for your request: {request1}"}
     session.reply(json.dumps(response))
     #print(dimensions)
@@ -118,4 +205,6 @@ question_state.go_to(base_state)
 # RUN APPLICATION
 
 if __name__ == '__main__':
+    # Importing the models no longer creates the schema; do it before serving.
+    init_db()
     agent.run()
\ No newline at end of file
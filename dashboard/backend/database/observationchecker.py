@@ -1,7 +1,16 @@
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import groupby, repeat
+from operator import itemgetter
 from pathlib import Path
+from typing import Iterator, Optional
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased, joinedload, raiseload
 
 CURRENT_DIR = Path(__file__).resolve()
 PROJECT_ROOT = CURRENT_DIR.parents[3]
@@ -10,178 +19,265 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from dashboard.backend.sql_alchemy import (
     SessionLocal,
+    engine,
     Observation,
     ObservationDimensionValue,
     Dimension,
     Category,
     DataTable,
+    init_db,
 )
 
-def export_observations_by_datatable(output_dir: str = "datatable_exports") -> dict:
+# Rows fetched (and written out) per round trip during an export.
+EXPORT_BATCH_SIZE = 10_000
+# Worker processes exporting datatables side by side; WAL lets them read concurrently.
+EXPORT_WORKERS = os.cpu_count() or 1
+
+ParentCategory = aliased(Category)
+
+# One exported observation; the variable parts are spliced in as encoded JSON.
+OBSERVATION_TEMPLATE = (
+    b'{"observation_id":%d,"value":%s,"time_period":%s,"dimensions":[%s],'
+    b'"interpretation":{"summary":%s,"details":[%s]}}'
+)
+
+# Everything the exports read from a dimension value, loaded with it rather than
+# lazily per row.
+DIMENSION_VALUE_LOADS = (
+    joinedload(ObservationDimensionValue.dimension),
+    joinedload(ObservationDimensionValue.category).joinedload(Category.parent),
+)
+
+@contextmanager
+def session_scope(session: Optional[Session] = None) -> Iterator[Session]:
+    """Yield ``session`` when given, otherwise a new session closed on exit.
+
+    The lookup helpers below accept an optional session so a caller making
+    several of them in a row can share one connection checkout.
     """
-    Export all observations organized by datatable, creating one JSON file per datatable.
-    Also creates a metadata file listing all available datatables.
-    
-    Args:
-        output_dir: Directory where JSON files will be saved
+    if session is not None:
+        yield session
+        return
+    with SessionLocal() as new_session:
+        yield new_session
+
+def _reset_engine_pool() -> None:
+    """Drop connections inherited from the parent so each export worker opens its own."""
+    engine.dispose(close=False)
+
+def _export_datatable(dt_idx: int, datatable: dict, output_dir: str, total: int) -> Optional[dict]:
+    """
+    Export one datatable's observations to its JSON file.
+    Runs in a worker process of export_observations_by_datatable.
     
     Returns:
-        Dictionary containing export statistics
+        The datatable's metadata entry, or None when it has no observations
     """
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    print(f"\nProcessing datatable {dt_idx}/{total}: {datatable['name']}")
     
     with SessionLocal() as session:
-        # Get all datatables
-        datatables = session.query(DataTable).all()
+        observation_count = (
+            session.query(func.count(Observation.id))
+            .filter(Observation.data_table_id == datatable["id"])
+            .scalar()
+        )
         
-        if not datatables:
-            print("No datatables found in the database!")
+        if not observation_count:
+            print(f"  No observations found for datatable: {datatable['name']}")
             return None
         
-        print(f"Found {len(datatables)} datatables to process...")
+        print(f"  Found {observation_count} observations")
+        
+        # Dimensions and categories are few and shared by every observation: build
+        # their output entries once and resolve each dimension value by id
+        dimensions = {
+            dim_id: ({"label": label, "code": code}, position)
+            for dim_id, label, code, position in session.execute(
+                select(Dimension.id, Dimension.label, Dimension.code, Dimension.position)
+                .where(Dimension.data_table_id == datatable["id"])
+            )
+        }
+        categories = {}
+        for cat_id, label, code, parent_label, parent_code in session.execute(
+            select(Category.id, Category.label, Category.code, ParentCategory.label, ParentCategory.code)
+            .outerjoin(ParentCategory, ParentCategory.id == Category.parent_id)
+            .where(Category.data_table_id == datatable["id"])
+        ):
+            categories[cat_id] = {"label": label, "code": code}
+            
+            # Add parent if exists
+            if parent_code is not None:
+                categories[cat_id]["parent"] = {"label": parent_label, "code": parent_code}
+        
+        # One row of ids per (observation, dimension value), read as plain tuples
+        # in batches; no ORM objects are built for the export
+        rows = session.execute(
+            select(
+                Observation.id,
+                Observation.value,
+                Observation.time_period,
+                ObservationDimensionValue.dimension_id,
+                ObservationDimensionValue.category_id,
+            )
+            .outerjoin(ObservationDimensionValue, ObservationDimensionValue.observation_id == Observation.id)
+            .where(Observation.data_table_id == datatable["id"])
+            .order_by(Observation.id, ObservationDimensionValue.dimension_id)
+        ).yield_per(EXPORT_BATCH_SIZE)
         
-        export_stats = {
-            "total_datatables": len(datatables),
-            "datatables_processed": [],
-            "total_observations_exported": 0
+        datatable_header = {
+            "datatable": {
+                "name": datatable["name"],
+                "code": datatable["code"],
+                "description": datatable["description"]
+            },
+            "total_observations": observation_count
         }
         
-        # Create metadata file for all datatables
-        datatables_metadata = []
+        # Generate filename from datatable code (sanitize for filesystem)
+        safe_code = datatable["code"].replace('@', '_').replace('/', '_').replace('\\', '_')
+        output_file = os.path.join(output_dir, f"datatable_{safe_code}.json")
         
-        # Process each datatable
-        for dt_idx, datatable in enumerate(datatables, 1):
-            print(f"\nProcessing datatable {dt_idx}/{len(datatables)}: {datatable.name}")
-            
-            # Get all observations for this datatable
-            observations = (
-                session.query(Observation)
-                .filter(Observation.data_table_id == datatable.id)
-                .all()
+        # A (dimension, category) pair always serialises the same way: encode its
+        # "dimensions" and "details" entries once and splice the bytes into every
+        # observation that uses it
+        encoded_links = {}
+        
+        def encode_link(dim_id: int, cat_id: int) -> tuple:
+            dimension, position = dimensions[dim_id]
+            category = categories[cat_id]
+            encoded_links[dim_id, cat_id] = (
+                position,
+                orjson.dumps({"dimension": dimension, "category": category}),
+                orjson.dumps({"dimension": dimension["label"], "value": category["label"]})
             )
-            
-            if not observations:
-                print(f"  No observations found for datatable: {datatable.name}")
-                continue
-            
-            print(f"  Found {len(observations)} observations")
-            
-            # Build the data structure for this datatable
-            datatable_export = {
-                "datatable": {
-                    "name": datatable.name,
-                    "code": datatable.code,
-                    "description": datatable.description if hasattr(datatable, 'description') else None
-                },
-                "total_observations": len(observations),
-                "observations": []
-            }
+            return encoded_links[dim_id, cat_id]
+        
+        with open(output_file, 'wb') as f:
+            # Header fields first (without the closing brace), then the
+            # observations array written one entry per line
+            f.write(orjson.dumps(datatable_header, option=orjson.OPT_INDENT_2)[:-2])
+            f.write(b',\n  "observations": [')
             
             # Process each observation in this datatable
-            for obs_idx, obs in enumerate(observations, 1):
-                if obs_idx % 1000 == 0:
-                    print(f"    Processed {obs_idx}/{len(observations)} observations...")
-                
-                observation_entry = {
-                    "observation_id": obs.id,
-                    "value": obs.value,
-                    "time_period": obs.time_period,
-                    "dimensions": []
-                }
+            for obs_idx, (obs_id, obs_rows) in enumerate(groupby(rows, key=itemgetter(0)), 1):
+                obs_rows = list(obs_rows)
+                _, value, time_period = obs_rows[0][:3]
                 
-                # Get all dimension values for this observation
-                dim_values = (
-                    session.query(ObservationDimensionValue)
-                    .filter(ObservationDimensionValue.observation_id == obs.id)
-                    .order_by(ObservationDimensionValue.dimension_id)
-                    .all()
-                )
+                # Rows arrive ordered by dimension id; an observation without
+                # dimension values yields a single row of NULLs
+                links = [
+                    encoded_links.get((dim_id, cat_id)) or encode_link(dim_id, cat_id)
+                    for _, _, _, dim_id, cat_id in obs_rows
+                    if dim_id is not None
+                ]
                 
-                # Add dimension values
-                for dv in dim_values:
-                    dimension_entry = {
-                        "dimension": {
-                            "label": dv.dimension.label,
-                            "code": dv.dimension.code
-                        },
-                        "category": {
-                            "label": dv.category.label,
-                            "code": dv.category.code
-                        }
-                    }
-                    
-                    # Add parent if exists
-                    if dv.category.parent:
-                        dimension_entry["category"]["parent"] = {
-                            "label": dv.category.parent.label,
-                            "code": dv.category.parent.code
-                        }
-                    
-                    observation_entry["dimensions"].append(dimension_entry)
+                summary = f"Value of {value} for the specified dimensions in {time_period}"
                 
-                # Build interpretation details
-                interpretation_parts = []
-                for dv in sorted(dim_values, key=lambda x: x.dimension.position):
-                    interpretation_parts.append({
-                        "dimension": dv.dimension.label,
-                        "value": dv.category.label
-                    })
-                
-                observation_entry["interpretation"] = {
-                    "summary": f"Value of {obs.value} for the specified dimensions in {obs.time_period}",
-                    "details": interpretation_parts
-                }
-                
-                datatable_export["observations"].append(observation_entry)
-            
-            # Generate filename from datatable code (sanitize for filesystem)
-            safe_code = datatable.code.replace('@', '_').replace('/', '_').replace('\\', '_')
-            output_file = os.path.join(output_dir, f"datatable_{safe_code}.json")
+                f.write(b"\n" if obs_idx == 1 else b",\n")
+                f.write(OBSERVATION_TEMPLATE % (
+                    obs_id,
+                    orjson.dumps(value),
+                    orjson.dumps(time_period),
+                    b",".join(link[1] for link in links),
+                    orjson.dumps(summary),
+                    # Interpretation details follow dimension position
+                    b",".join(link[2] for link in sorted(links, key=itemgetter(0)))
+                ))
             
-            # Save this datatable's observations to JSON
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(datatable_export, f, indent=2, ensure_ascii=False)
-            
-            print(f"  Exported to: {output_file}")
-            
-            # Update statistics
-            export_stats["datatables_processed"].append({
-                "name": datatable.name,
-                "code": datatable.code,
-                "file": output_file,
-                "observation_count": len(observations)
-            })
-            export_stats["total_observations_exported"] += len(observations)
-            
-            # Add to metadata
-            datatables_metadata.append({
-                "name": datatable.name,
-                "code": datatable.code,
-                "description": datatable.description if hasattr(datatable, 'description') else None,
-                "observation_count": len(observations),
-                "file": f"datatable_{safe_code}.json"
-            })
-        
-        # Save metadata file
-        metadata_file = os.path.join(output_dir, "datatables_metadata.json")
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "total_datatables": len(datatables_metadata),
-                "total_observations": export_stats["total_observations_exported"],
-                "datatables": datatables_metadata
-            }, f, indent=2, ensure_ascii=False)
+            f.write(b"\n  ]\n}")
         
-        print(f"\n{'='*60}")
-        print(f"EXPORT COMPLETE")
-        print(f"{'='*60}")
-        print(f"Total datatables exported: {len(export_stats['datatables_processed'])}")
-        print(f"Total observations exported: {export_stats['total_observations_exported']}")
-        print(f"Output directory: {output_dir}")
-        print(f"Metadata file: {metadata_file}")
-        print(f"{'='*60}\n")
-        
-        return export_stats
+        print(f"  Exported to: {output_file}")
+    
+    return {
+        "name": datatable["name"],
+        "code": datatable["code"],
+        "description": datatable["description"],
+        "observation_count": observation_count,
+        "file": f"datatable_{safe_code}.json"
+    }
+
+def export_observations_by_datatable(output_dir: str = "datatable_exports") -> dict:
+    """
+    Export all observations organized by datatable, creating one JSON file per datatable.
+    Also creates a metadata file listing all available datatables.
+    
+    Datatables are independent, so they are exported in parallel worker processes.
+    
+    Args:
+        output_dir: Directory where JSON files will be saved
+    
+    Returns:
+        Dictionary containing export statistics
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    
+    with SessionLocal() as session:
+        # Get all datatables
+        datatables = [
+            row._asdict()
+            for row in session.query(
+                DataTable.id, DataTable.name, DataTable.code, DataTable.description
+            )
+        ]
+    
+    if not datatables:
+        print("No datatables found in the database!")
+        return None
+    
+    print(f"Found {len(datatables)} datatables to process...")
+    
+    export_stats = {
+        "total_datatables": len(datatables),
+        "datatables_processed": [],
+        "total_observations_exported": 0
+    }
+    
+    # Process each datatable; results come back in datatable order
+    with ProcessPoolExecutor(
+        max_workers=min(EXPORT_WORKERS, len(datatables)),
+        initializer=_reset_engine_pool,
+    ) as executor:
+        exported = list(executor.map(
+            _export_datatable,
+            range(1, len(datatables) + 1),
+            datatables,
+            repeat(output_dir),
+            repeat(len(datatables)),
+        ))
+    
+    # Create metadata file for all datatables
+    datatables_metadata = [entry for entry in exported if entry is not None]
+    
+    for entry in datatables_metadata:
+        # Update statistics
+        export_stats["datatables_processed"].append({
+            "name": entry["name"],
+            "code": entry["code"],
+            "file": os.path.join(output_dir, entry["file"]),
+            "observation_count": entry["observation_count"]
+        })
+        export_stats["total_observations_exported"] += entry["observation_count"]
+    
+    # Save metadata file
+    metadata_file = os.path.join(output_dir, "datatables_metadata.json")
+    with open(metadata_file, 'wb') as f:
+        f.write(orjson.dumps({
+            "total_datatables": len(datatables_metadata),
+            "total_observations": export_stats["total_observations_exported"],
+            "datatables": datatables_metadata
+        }, option=orjson.OPT_INDENT_2))
+    
+    print(f"\n{'='*60}")
+    print(f"EXPORT COMPLETE")
+    print(f"{'='*60}")
+    print(f"Total datatables exported: {len(export_stats['datatables_processed'])}")
+    print(f"Total observations exported: {export_stats['total_observations_exported']}")
+    print(f"Output directory: {output_dir}")
+    print(f"Metadata file: {metadata_file}")
+    print(f"{'='*60}\n")
+    
+    return export_stats
 
 def explain_observation_to_json(obs_id: int, output_file: str = None) -> dict:
     """
@@ -200,7 +296,12 @@ def explain_observation_to_json(obs_id: int, output_file: str = None) -> dict:
     
     with SessionLocal() as session:
         # Get the observation
-        obs = session.query(Observation).filter(Observation.id == obs_id).first()
+        obs = (
+            session.query(Observation)
+            .options(joinedload(Observation.data_table), raiseload("*"))
+            .filter(Observation.id == obs_id)
+            .first()
+        )
         
         if not obs:
             print(f"Observation {obs_id} not found!")
@@ -222,6 +323,7 @@ def explain_observation_to_json(obs_id: int, output_file: str = None) -> dict:
         # Get all dimension values for this observation
         dim_values = (
             session.query(ObservationDimensionValue)
+            .options(*DIMENSION_VALUE_LOADS)
             .filter(ObservationDimensionValue.observation_id == obs_id)
             .order_by(ObservationDimensionValue.dimension_id)
             .all()
@@ -270,10 +372,10 @@ def explain_observation_to_json(obs_id: int, output_file: str = None) -> dict:
         
         return observation_data
 
-def fetch_all_datatables() -> str:
+def fetch_all_datatables(session: Optional[Session] = None) -> str:
     """Fetch and return all datatables with their name and description as a single string."""
-    with SessionLocal() as session:
-        datatables = session.query(DataTable).all()
+    with session_scope(session) as session:
+        datatables = session.query(DataTable.name, DataTable.description).all()
 
         if not datatables:
             return "No datatables found!\n"
@@ -283,34 +385,49 @@ def fetch_all_datatables() -> str:
         lines.append("DATATABLES")
         lines.append("=" * 60)
 
-        for dt in datatables:
-            lines.append(f"Name: {dt.name}")
-            lines.append(f"Description: {dt.description}")
+        for name, description in datatables:
+            lines.append(f"Name: {name}")
+            lines.append(f"Description: {description}")
             lines.append("-" * 60)
 
         return "\n".join(lines) + "\n"
 
 
-def get_datatable_id_by_name(name: str) -> int:
+def get_datatable_names(session: Optional[Session] = None) -> list[str]:
+    """Fetch and return the names of all datatables."""
+    with session_scope(session) as session:
+        return [name for (name,) in session.query(DataTable.name).all()]
+
+
+def get_datatable_id_by_name(name: str, session: Optional[Session] = None) -> int:
     """Fetch and return the ID of a datatable based on its name."""
-    with SessionLocal() as session:
-        datatable = session.query(DataTable).filter(DataTable.name == name).first()
+    with session_scope(session) as session:
+        datatable_id = session.query(DataTable.id).filter(DataTable.name == name).scalar()
 
-        if not datatable:
+        if datatable_id is None:
             raise ValueError(f"No datatable found with the name: {name}")
 
-        return datatable.id
+        return datatable_id
 
 
-def get_dimensions_by_datatable_id(datatable_id: int) -> str:
+def get_dimensions_by_datatable_id(datatable_id: int, session: Optional[Session] = None) -> str:
     """Fetch and return all necessary dimensions linked to a datatable as a JSON string."""
-    with SessionLocal() as session:
+    with session_scope(session) as session:
+        # EXISTS yields each dimension once in SQL instead of one row per category
+        # that the ORM would then have to de-duplicate.
+        has_applicable_category = (
+            session.query(Category.id)
+            .filter(
+                Category.dimension_id == Dimension.id,
+                Category.name != "Not applicable"
+            )
+            .exists()
+        )
         dimensions = (
-            session.query(Dimension)
-            .join(Category, Category.dimension_id == Dimension.id)
+            session.query(Dimension.id, Dimension.name, Dimension.label, Dimension.code)
             .filter(
                 Dimension.data_table_id == datatable_id,
-                Category.name != "Not applicable"
+                has_applicable_category
             )
             .all()
         )
@@ -332,43 +449,50 @@ def get_dimensions_by_datatable_id(datatable_id: int) -> str:
         return json.dumps(result, indent=4)
 
 
-def get_dimension_ids_by_names(names: list[str]) -> list[int]:
+def get_dimension_ids_by_names(names: list[str], session: Optional[Session] = None) -> list[int]:
     """Fetch and return the IDs of dimensions based on their names."""
-    with SessionLocal() as session:
-        dimensions = (
-            session.query(Dimension)
+    with session_scope(session) as session:
+        dimension_ids = (
+            session.query(Dimension.id)
             .filter(Dimension.name.in_(names))
             .all()
         )
 
-        if not dimensions:
-            return []
-
-        return [dimension.id for dimension in dimensions]
+        return [dimension_id for (dimension_id,) in dimension_ids]
 
 
-def get_observation_values(datatable_id: int, dimension_ids: list[int]) -> list[float]:
+def get_observation_values(
+    datatable_id: int, dimension_ids: list[int], session: Optional[Session] = None
+) -> list[float]:
     """Fetch and return all observation values for a given datatable ID and list of dimension IDs."""
-    with SessionLocal() as session:
-        observations = (
-            session.query(Observation)
-            .join(ObservationDimensionValue, Observation.id == ObservationDimensionValue.observation_id)
+    with session_scope(session) as session:
+        # EXISTS returns each matching observation once, instead of one joined row
+        # per matching dimension value for the ORM to de-duplicate
+        has_dimension_value = (
+            session.query(ObservationDimensionValue.id)
             .filter(
-                Observation.data_table_id == datatable_id,
+                ObservationDimensionValue.observation_id == Observation.id,
                 ObservationDimensionValue.dimension_id.in_(dimension_ids)
             )
-            .all()
+            .exists()
+        )
+        values = (
+            session.query(Observation.value)
+            .filter(
+                Observation.data_table_id == datatable_id,
+                has_dimension_value
+            )
+            .yield_per(5000)
         )
 
-        if not observations:
-            return []
-
-        return [obs.value for obs in observations]
+        return [value for (value,) in values]
 
 
-def get_observation_ids_by_dimension(datatable_id: int, dimension_id: int) -> list[int]:
+def get_observation_ids_by_dimension(
+    datatable_id: int, dimension_id: int, session: Optional[Session] = None
+) -> list[int]:
     """Fetch and return all observation IDs linked to a given dimension ID and datatable ID."""
-    with SessionLocal() as session:
+    with session_scope(session) as session:
         observation_ids = (
             session.query(ObservationDimensionValue.observation_id)
             .join(Observation, Observation.id == ObservationDimensionValue.observation_id)
@@ -383,6 +507,9 @@ def get_observation_ids_by_dimension(datatable_id: int, dimension_id: int) -> li
 
 
 if __name__ == "__main__":
+    # Importing the models no longer creates the schema; do it before querying.
+    init_db()
+
     # Export all observations organized by datatable
     export_observations_by_datatable()
 
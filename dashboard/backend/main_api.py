@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import itertools
 import re
-from urllib.parse import unquote
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
 
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+import orjson
 from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import func
-from sqlalchemy.orm import Session, aliased, selectinload
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import and_, bindparam, case, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased, raiseload, selectinload
 
 try:  # pragma: no cover - allow execution as module or script
     from .sql_alchemy import (
@@ -18,7 +27,8 @@ try:  # pragma: no cover - allow execution as module or script
         Dimension,
         Observation,
         ObservationDimensionValue,
-        SessionLocal,
+        create_api_engine,
+        init_db,
     )
     from .pydantic_classes import (
         AggregateItem,
@@ -29,7 +39,7 @@ try:  # pragma: no cover - allow execution as module or script
         DataTableSummary,
         DimensionDetail,
         DimensionSummary,
-        ObservationPoint,
+        ObservationPage,
     )
 except ImportError:  # pragma: no cover
     from sql_alchemy import (
@@ -39,7 +49,8 @@ except ImportError:  # pragma: no cover
         Dimension,
         Observation,
         ObservationDimensionValue,
-        SessionLocal,
+        create_api_engine,
+        init_db,
     )
     from pydantic_classes import (
         AggregateItem,
@@ -50,11 +61,28 @@ except ImportError:  # pragma: no cover
         DataTableSummary,
         DimensionDetail,
         DimensionSummary,
-        ObservationPoint,
+        ObservationPage,
     )
 
 
-app = FastAPI(title="Statec Census API", version="1.0.0")
+OBSERVATION_STREAM_CHUNK = 500
+
+async_engine = create_api_engine()
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Close the pooled aiosqlite connections so their threads exit with the app.
+    await async_engine.dispose()
+
+
+app = FastAPI(
+    title="Statec Census API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -65,22 +93,50 @@ app.add_middleware(
 )
 
 
-def get_db() -> Session:
-    session: Session = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as session:
         yield session
-    finally:
-        session.close()
 
 
-def _get_datatable_by_code(db: Session, dataset_code: str) -> DataTable:
-    # URL decode the dataset code in case it comes with %40 instead of @
-    dataset_code = unquote(dataset_code)
+# Fixed-shape statements are built once at import and only re-bound per request.
+# Handlers only read DataTable columns, so any relationship access fails loudly.
+_SELECT_DATATABLE_BY_CODE = (
+    select(DataTable)
+    .options(raiseload("*"))
+    .where(DataTable.code == bindparam("dataset_code"))
+)
+# Column projection: listing datasets needs no DataTable instances.
+_SELECT_DATATABLE_SUMMARIES = select(
+    DataTable.id,
+    DataTable.code,
+    DataTable.name,
+    DataTable.description,
+    DataTable.provider,
+    DataTable.updated_at,
+    DataTable.version,
+).order_by(DataTable.name)
+_COUNT_DIMENSIONS_BY_TABLE = select(
+    Dimension.data_table_id, func.count(Dimension.id)
+).group_by(Dimension.data_table_id)
+_COUNT_OBSERVATIONS_BY_TABLE = select(
+    Observation.data_table_id, func.count(Observation.id)
+).group_by(Observation.data_table_id)
+_COUNT_OBSERVATIONS_FOR_TABLE = select(func.count(Observation.id)).where(
+    Observation.data_table_id == bindparam("datatable_id")
+)
+_SELECT_LATEST_PERIOD = (
+    select(Observation.time_period)
+    .where(Observation.data_table_id == bindparam("datatable_id"))
+    .where(Observation.time_period.isnot(None))
+    .order_by(Observation.time_period.desc())
+    .limit(1)
+)
+
+
+async def _get_datatable_by_code(db: AsyncSession, dataset_code: str) -> DataTable:
     datatable = (
-        db.query(DataTable)
-        .filter(DataTable.code == dataset_code)
-        .one_or_none()
-    )
+        await db.execute(_SELECT_DATATABLE_BY_CODE, {"dataset_code": dataset_code})
+    ).scalar_one_or_none()
     if datatable is None:
         raise HTTPException(
             status_code=404,
@@ -89,31 +145,69 @@ def _get_datatable_by_code(db: Session, dataset_code: str) -> DataTable:
     return datatable
 
 
-def _counts_by_table(
-    db: Session,
+# Per-table counts only change when data_fetch.py runs (a separate process), which
+# increments the dataset's version in the same transaction. The cache is keyed on every
+# (id, version) pair, so /datasets agrees with /datasets/{code} right after an ingest.
+_COUNTS_CACHE: Dict[str, Tuple[object, Dict[int, int], Dict[int, int]]] = {}
+_COUNTS_CACHE_LOCK = threading.Lock()
+
+
+async def _counts_by_table(
+    db: AsyncSession,
+    version: object,
 ) -> Tuple[Dict[int, int], Dict[int, int]]:
+    with _COUNTS_CACHE_LOCK:
+        cached = _COUNTS_CACHE.get("counts")
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+
     dimension_counts: Dict[int, int] = dict(
-        db.query(Dimension.data_table_id, func.count(Dimension.id))
-        .group_by(Dimension.data_table_id)
-        .all()
+        (await db.execute(_COUNT_DIMENSIONS_BY_TABLE)).all()
     )
     observation_counts: Dict[int, int] = dict(
-        db.query(Observation.data_table_id, func.count(Observation.id))
-        .group_by(Observation.data_table_id)
-        .all()
+        (await db.execute(_COUNT_OBSERVATIONS_BY_TABLE)).all()
     )
+    with _COUNTS_CACHE_LOCK:
+        _COUNTS_CACHE["counts"] = (version, dimension_counts, observation_counts)
     return dimension_counts, observation_counts
 
 
+# Results derived from one dataset, keyed by its version, which data_fetch.py
+# increments on every re-ingestion; a new version simply misses, so no TTL is needed.
+VERSIONED_CACHE_SIZE = 1024
+_VERSIONED_CACHE: "OrderedDict[Tuple[object, ...], object]" = OrderedDict()
+_VERSIONED_CACHE_LOCK = threading.Lock()
+
+
+def _version_key(kind: str, datatable: DataTable, *parts: object) -> Tuple[object, ...]:
+    return (kind, datatable.id, datatable.version, *parts)
+
+
+def _versioned_cache_get(key: Tuple[object, ...]):
+    with _VERSIONED_CACHE_LOCK:
+        value = _VERSIONED_CACHE.get(key)
+        if value is not None:
+            _VERSIONED_CACHE.move_to_end(key)
+        return value
+
+
+def _versioned_cache_put(key: Tuple[object, ...], value: object) -> None:
+    with _VERSIONED_CACHE_LOCK:
+        _VERSIONED_CACHE[key] = value
+        while len(_VERSIONED_CACHE) > VERSIONED_CACHE_SIZE:
+            _VERSIONED_CACHE.popitem(last=False)
+
+
 @app.get("/health", tags=["meta"])
-def healthcheck() -> Dict[str, str]:
+async def healthcheck() -> Dict[str, str]:
     return {"status": "ok"}
 
 
 @app.get("/datasets", response_model=List[DataTableSummary], tags=["datasets"])
-def list_datasets(db: Session = Depends(get_db)) -> List[DataTableSummary]:
-    tables = db.query(DataTable).order_by(DataTable.name).all()
-    dimension_counts, observation_counts = _counts_by_table(db)
+async def list_datasets(db: AsyncSession = Depends(get_db)) -> List[DataTableSummary]:
+    tables = (await db.execute(_SELECT_DATATABLE_SUMMARIES)).all()
+    version = tuple((table.id, table.version) for table in tables)
+    dimension_counts, observation_counts = await _counts_by_table(db, version)
     summaries: List[DataTableSummary] = []
     for table in tables:
         summaries.append(
@@ -135,20 +229,39 @@ def list_datasets(db: Session = Depends(get_db)) -> List[DataTableSummary]:
     response_model=DataTableDetail,
     tags=["datasets"],
 )
-def get_dataset(dataset_code: str, db: Session = Depends(get_db)) -> DataTableDetail:
-    # URL decode the dataset code
-    dataset_code = unquote(dataset_code)
-    datatable = _get_datatable_by_code(db, dataset_code)
-    dimension_counts, observation_counts = _counts_by_table(db)
+async def get_dataset(dataset_code: str, db: AsyncSession = Depends(get_db)) -> DataTableDetail:
+    datatable = await _get_datatable_by_code(db, dataset_code)
+    cache_key = _version_key("dataset", datatable)
+    cached = _versioned_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    observation_count = await db.scalar(
+        _COUNT_OBSERVATIONS_FOR_TABLE, {"datatable_id": datatable.id}
+    )
 
-    # Load only the dimensions attached to this dataset
-    dimensions = (
-        db.query(Dimension)
-        .options(selectinload(Dimension.categories))
-        .filter(Dimension.data_table_id == datatable.id)
-        .order_by(Dimension.position, Dimension.code)
-        .all()
+    # Load only the dimensions attached to this dataset, with their category
+    # counts computed in the same grouped query instead of loading categories.
+    excluded_codes = sorted(EXCLUDED_CATEGORY_CODES)
+    applicable = case(
+        (
+            and_(
+                Category.id.isnot(None),
+                func.upper(func.coalesce(Category.code, "")).notin_(excluded_codes),
+            ),
+            1,
+        )
     )
+    rows = (
+        await db.execute(
+            select(Dimension, func.count(Category.id), func.count(applicable))
+            .options(raiseload("*"))
+            .outerjoin(Category, Category.dimension_id == Dimension.id)
+            .where(Dimension.data_table_id == datatable.id)
+            .group_by(Dimension.id)
+            .order_by(Dimension.position, Dimension.code)
+        )
+    ).all()
 
     dimension_summaries = [
         DimensionSummary(
@@ -157,22 +270,24 @@ def get_dataset(dataset_code: str, db: Session = Depends(get_db)) -> DataTableDe
             label=dimension.label,
             position=dimension.position,
             codelist_id=dimension.codelist_id,
-            category_count=len(dimension.categories),
-            applicable_category_count=_count_applicable_categories(dimension),
+            category_count=category_count,
+            applicable_category_count=applicable_count,
         )
-        for dimension in dimensions
+        for dimension, category_count, applicable_count in rows
     ]
 
-    return DataTableDetail(
+    detail = DataTableDetail(
         code=datatable.code,
         name=datatable.name,
         description=datatable.description,
         provider=datatable.provider,
         updated_at=datatable.updated_at,
-        dimension_count=len(dimensions),
-        observation_count=observation_counts.get(datatable.id, 0),
+        dimension_count=len(rows),
+        observation_count=observation_count or 0,
         dimensions=dimension_summaries,
     )
+    _versioned_cache_put(cache_key, detail)
+    return detail
 
 
 @app.get(
@@ -180,113 +295,199 @@ def get_dataset(dataset_code: str, db: Session = Depends(get_db)) -> DataTableDe
     response_model=DimensionDetail,
     tags=["dimensions"],
 )
-def get_dimension_detail(
+async def get_dimension_detail(
     dataset_code: str,
     dimension_code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> DimensionDetail:
-    # URL decode dataset code (not needed for dimension_code as it's simple)
-    dataset_code = unquote(dataset_code)
-    datatable = _get_datatable_by_code(db, dataset_code)
+    datatable = await _get_datatable_by_code(db, dataset_code)
+    cache_key = _version_key("dimension", datatable, dimension_code)
+    cached = _versioned_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     dimension: Optional[Dimension] = (
-        db.query(Dimension)
-        .options(
-            selectinload(Dimension.categories).selectinload(Category.parent)
-        )
-        .filter(
-            Dimension.data_table_id == datatable.id,
-            Dimension.code == dimension_code,
+        await db.execute(
+            select(Dimension)
+            .options(raiseload("*"))
+            .where(
+                Dimension.data_table_id == datatable.id,
+                Dimension.code == dimension_code,
+            )
         )
-        .one_or_none()
-    )
+    ).scalar_one_or_none()
     if dimension is None:
         raise HTTPException(
             status_code=404,
             detail=f"Dimension '{dimension_code}' not found.",
         )
 
-    categories = sorted(
-        dimension.categories,
-        key=lambda category: (category.parent_id or 0, category.code),
-    )
+    # Roots first, then by parent and code; the database sorts, not Python.
+    parent = aliased(Category)
+    category_rows = (
+        await db.execute(
+            select(Category.code, Category.name, Category.label, parent.code)
+            .outerjoin(parent, Category.parent_id == parent.id)
+            .where(Category.dimension_id == dimension.id)
+            .order_by(func.coalesce(Category.parent_id, 0), Category.code)
+        )
+    ).all()
 
     category_payload = [
         CategoryRead(
-            code=category.code,
-            name=category.name,
-            label=category.label,
-            parent_code=category.parent.code if category.parent else None,
+            code=code,
+            name=name,
+            label=label,
+            parent_code=parent_code,
         )
-        for category in categories
+        for code, name, label, parent_code in category_rows
     ]
 
-    return DimensionDetail(
+    detail = DimensionDetail(
         code=dimension.code,
         name=dimension.name,
         label=dimension.label,
         position=dimension.position,
         codelist_id=dimension.codelist_id,
         category_count=len(category_payload),
-        applicable_category_count=_count_applicable_categories(dimension),
+        applicable_category_count=_count_applicable_categories(
+            code for code, _, _, _ in category_rows
+        ),
         categories=category_payload,
     )
+    _versioned_cache_put(cache_key, detail)
+    return detail
+
+
+def _observation_rows_query(
+    datatable_id: int,
+    limit: Optional[int],
+    cursor: Optional[int],
+):
+    page = (
+        select(Observation.id)
+        .where(Observation.data_table_id == datatable_id)
+        .order_by(Observation.id)
+    )
+    if cursor is not None:
+        # Keyset pagination: resume after the last id the client has seen.
+        page = page.where(Observation.id > cursor)
+    if limit is not None:
+        page = page.limit(limit)
+    page = page.subquery()
+
+    # Flat rows, grouped per observation by the caller: no ORM instances to build.
+    return (
+        select(
+            Observation.id,
+            Observation.value,
+            Observation.time_period,
+            Dimension.code,
+            Category.code,
+        )
+        .join(page, page.c.id == Observation.id)
+        .outerjoin(
+            ObservationDimensionValue,
+            ObservationDimensionValue.observation_id == Observation.id,
+        )
+        .outerjoin(Dimension, ObservationDimensionValue.dimension_id == Dimension.id)
+        .outerjoin(Category, ObservationDimensionValue.category_id == Category.id)
+        .order_by(Observation.id, ObservationDimensionValue.id)
+    )
+
+
+async def _stream_observation_lines(
+    datatable_id: int,
+    limit: Optional[int],
+    cursor: Optional[int],
+) -> AsyncIterator[bytes]:
+    # The request-scoped session is closed once the endpoint returns, so the
+    # stream owns its own session for as long as the client keeps reading.
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            _observation_rows_query(datatable_id, limit, cursor).execution_options(
+                yield_per=OBSERVATION_STREAM_CHUNK
+            )
+        )
+        current: Optional[dict] = None
+        async for observation_id, value, time_period, dimension_code, category_code in result:
+            if current is None or current["observation_id"] != observation_id:
+                if current is not None:
+                    yield orjson.dumps(current) + b"\n"
+                current = {
+                    "observation_id": observation_id,
+                    "value": float(value),
+                    "time_period": time_period,
+                    "dimensions": {},
+                }
+            if dimension_code is not None and category_code is not None:
+                current["dimensions"][dimension_code] = category_code
+        if current is not None:
+            yield orjson.dumps(current) + b"\n"
 
 
 @app.get(
     "/datasets/{dataset_code}/observations",
-    response_model=List[ObservationPoint],
+    response_model=ObservationPage,
     tags=["observations"],
 )
-def list_observations(
+async def list_observations(
     dataset_code: str,
     limit: int = Query(100, gt=0, le=1000),
-    db: Session = Depends(get_db),
-) -> List[ObservationPoint]:
-    dataset_code = unquote(dataset_code)
-    datatable = _get_datatable_by_code(db, dataset_code)
-    observations = (
-        db.query(Observation)
-        .filter(Observation.data_table_id == datatable.id)
-        .options(
-            selectinload(Observation.dimension_values)
-            .selectinload(ObservationDimensionValue.dimension),
-            selectinload(Observation.dimension_values)
-            .selectinload(ObservationDimensionValue.category),
-        )
-        .order_by(Observation.id)
-        .limit(limit)
-        .all()
-    )
-
-    observation_payload: List[ObservationPoint] = []
-    for observation in observations:
+    cursor: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> ORJSONResponse:
+    datatable = await _get_datatable_by_code(db, dataset_code)
+    rows = (await db.execute(_observation_rows_query(datatable.id, limit, cursor))).all()
+
+    # Plain dicts straight to orjson: a page holds up to 1000 points, and building
+    # and re-serialising an ObservationPoint for each one dominated the handler.
+    items: List[dict] = []
+    for observation_id, observation_rows in itertools.groupby(rows, key=itemgetter(0)):
         dimensions_map: Dict[str, str] = {}
-        for mapping in observation.dimension_values:
-            if mapping.dimension and mapping.category:
-                dimensions_map[mapping.dimension.code] = mapping.category.code
-        observation_payload.append(
-            ObservationPoint(
-                observation_id=observation.id,
-                value=float(observation.value),
-                time_period=observation.time_period,
-                dimensions=dimensions_map,
-            )
+        for _, value, time_period, dimension_code, category_code in observation_rows:
+            if dimension_code is not None and category_code is not None:
+                dimensions_map[dimension_code] = category_code
+        items.append(
+            {
+                "observation_id": observation_id,
+                "value": float(value),
+                "time_period": time_period,
+                "dimensions": dimensions_map,
+            }
         )
-    return observation_payload
+    next_cursor = items[-1]["observation_id"] if len(items) == limit else None
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
 
 
-TOTAL_CATEGORY_CODES = {"_T", "TOTAL", "TOT"}
-NON_APPLICABLE_CATEGORY_CODES = {"_Z", "_X", "_N", "_U"}
+@app.get(
+    "/datasets/{dataset_code}/observations.ndjson",
+    tags=["observations"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def stream_observations(
+    dataset_code: str,
+    limit: Optional[int] = Query(None, gt=0),
+    cursor: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream observations as NDJSON, one ObservationPoint per line, without a page cap."""
+    datatable = await _get_datatable_by_code(db, dataset_code)
+    return StreamingResponse(
+        _stream_observation_lines(datatable.id, limit, cursor),
+        media_type="application/x-ndjson",
+    )
 
 
-def _count_applicable_categories(dimension: Dimension) -> int:
-    count = 0
-    for category in dimension.categories:
-        code = (category.code or "").upper()
-        if code in TOTAL_CATEGORY_CODES or code in NON_APPLICABLE_CATEGORY_CODES:
-            continue
-        count += 1
-    return count
+TOTAL_CATEGORY_CODES = frozenset({"_T", "TOTAL", "TOT"})
+NON_APPLICABLE_CATEGORY_CODES = frozenset({"_Z", "_X", "_N", "_U"})
+EXCLUDED_CATEGORY_CODES = TOTAL_CATEGORY_CODES | NON_APPLICABLE_CATEGORY_CODES
+
+
+def _count_applicable_categories(category_codes: Iterable[Optional[str]]) -> int:
+    excluded = EXCLUDED_CATEGORY_CODES
+    return sum(1 for code in category_codes if (code or "").upper() not in excluded)
 
 
 def _normalise_filter_values(
@@ -307,73 +508,89 @@ def _normalise_filter_values(
     return normalised
 
 
-def _default_total_filters(datatable: DataTable) -> Dict[str, str]:
+async def _default_total_filters(db: AsyncSession, datatable: DataTable) -> Mapping[str, str]:
+    key = _version_key("default_totals", datatable)
+    totals = _versioned_cache_get(key)
+    if totals is None:
+        totals = MappingProxyType(await _compute_default_totals(db, datatable.id))
+        _versioned_cache_put(key, totals)
+    return totals
+
+
+async def _compute_default_totals(db: AsyncSession, datatable_id: int) -> Dict[str, str]:
+    # Relationships cannot lazy load on an AsyncSession, so fetch them up front.
+    dimensions = (
+        await db.scalars(
+            select(Dimension)
+            .options(selectinload(Dimension.categories), raiseload("*"))
+            .where(Dimension.data_table_id == datatable_id)
+        )
+    ).all()
+    total_codes = TOTAL_CATEGORY_CODES
     totals: Dict[str, str] = {}
-    for dimension in datatable.dimensions:
+    for dimension in dimensions:
+        # One pass: a total code wins, else the first "_" code, else the first code.
+        total_candidate = underscore_candidate = first_candidate = None
+        for cat in dimension.categories:
+            if first_candidate is None:
+                first_candidate = cat.code
+            if cat.code in total_codes:
+                total_candidate = cat.code
+                break
+            if underscore_candidate is None and cat.code.startswith("_"):
+                underscore_candidate = cat.code
         candidate = next(
-            (cat.code for cat in dimension.categories if cat.code in TOTAL_CATEGORY_CODES),
+            (
+                code
+                for code in (total_candidate, underscore_candidate, first_candidate)
+                if code is not None
+            ),
             None,
         )
-        if candidate is None:
-            candidate = next(
-                (cat.code for cat in dimension.categories if cat.code.startswith("_")),
-                None,
-            )
-        if candidate is None and dimension.categories:
-            candidate = dimension.categories[0].code
         if candidate is not None:
             totals[dimension.code] = candidate
     return totals
 
 
 def _apply_dimension_filter(query, dim_code: str, values: Sequence[str]):
+    # A correlated EXISTS per filter keeps the outer row count unchanged,
+    # unlike joining three more tables into the aggregate for every filter.
     dim_alias = aliased(Dimension)
     cat_alias = aliased(Category)
     odv_alias = aliased(ObservationDimensionValue)
-    query = query.join(odv_alias, Observation.dimension_values)
-    query = query.join(dim_alias, odv_alias.dimension)
-    query = query.filter(dim_alias.code == dim_code)
-    query = query.join(cat_alias, odv_alias.category)
     if len(values) == 1:
-        query = query.filter(cat_alias.code == values[0])
+        category_match = cat_alias.code == values[0]
     else:
-        query = query.filter(cat_alias.code.in_(list(values)))
-    return query
-
-
-def _aggregate_dimension(
-    db: Session,
-    datatable: DataTable,
-    dimension_code: str,
-    filters: Optional[Dict[str, Sequence[str]]] = None,
-    order: str = "desc",
-    limit: Optional[int] = None,
-) -> Tuple[List[AggregateItem], float, float]:
-    dimension_code = dimension_code.upper()
-    filt = _normalise_filter_values(filters)
-
-    agg_dimension = (
-        db.query(Dimension)
-        .options(selectinload(Dimension.categories))
-        .filter(
-            Dimension.data_table_id == datatable.id,
-            Dimension.code == dimension_code,
+        category_match = cat_alias.code.in_(list(values))
+    match = (
+        select(1)
+        .select_from(odv_alias)
+        .join(dim_alias, odv_alias.dimension_id == dim_alias.id)
+        .join(cat_alias, odv_alias.category_id == cat_alias.id)
+        .where(
+            odv_alias.observation_id == Observation.id,
+            dim_alias.code == dim_code,
+            category_match,
         )
-        .one_or_none()
+        .correlate(Observation)
     )
-    if agg_dimension is None:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Dimension '{dimension_code}' not available.",
-        )
+    return query.where(match.exists())
+
 
+def _aggregate_query(
+    datatable: DataTable,
+    agg_dimension: Dimension,
+    filt: Dict[str, List[str]],
+    branch: int = 0,
+):
     agg_odv = aliased(ObservationDimensionValue)
     agg_cat = aliased(Category)
     agg_dim = aliased(Dimension)
     value_expr = func.sum(Observation.value)
 
     query = (
-        db.query(
+        select(
+            literal(branch).label("branch"),
             agg_cat.code.label("category_code"),
             agg_cat.label.label("category_label"),
             agg_cat.name.label("category_name"),
@@ -383,71 +600,151 @@ def _aggregate_dimension(
         .join(agg_odv, Observation.id == agg_odv.observation_id)
         .join(agg_dim, agg_odv.dimension_id == agg_dim.id)
         .join(agg_cat, agg_odv.category_id == agg_cat.id)
-        .filter(Observation.data_table_id == datatable.id)
-        .filter(agg_dim.id == agg_dimension.id)
+        .where(Observation.data_table_id == datatable.id)
+        .where(agg_dim.id == agg_dimension.id)
     )
 
     for filter_dim_code, values in filt.items():
         if filter_dim_code == "TIME_PERIOD":
-            query = query.filter(Observation.time_period.in_(values))
+            query = query.where(Observation.time_period.in_(values))
             continue
-        if filter_dim_code == dimension_code:
+        if filter_dim_code == agg_dimension.code:
             if len(values) == 1:
-                query = query.filter(agg_cat.code == values[0])
+                query = query.where(agg_cat.code == values[0])
             else:
-                query = query.filter(agg_cat.code.in_(list(values)))
+                query = query.where(agg_cat.code.in_(list(values)))
             continue
         query = _apply_dimension_filter(query, filter_dim_code, values)
 
-    query = query.group_by(agg_cat.code, agg_cat.label, agg_cat.name)
+    return query.group_by(agg_cat.code, agg_cat.label, agg_cat.name)
 
-    if order.lower() == "asc":
-        query = query.order_by(value_expr.asc())
-    else:
-        query = query.order_by(value_expr.desc())
 
-    if limit:
-        query = query.limit(limit)
-
-    rows = query.all()
+def _aggregate_items(rows) -> Tuple[List[AggregateItem], float, float]:
     if not rows:
         return [], 0.0, 0.0
 
-    non_total_sum = sum(
-        float(row.value or 0.0)
+    results = [
+        AggregateItem(
+            category_code=row.category_code,
+            category_label=row.category_label or row.category_name or row.category_code,
+            value=float(row.value),
+            share=row.share,
+        )
         for row in rows
-        if row.category_code not in TOTAL_CATEGORY_CODES
+    ]
+    return results, float(rows[0].reference_total), float(rows[0].total_row_value)
+
+
+async def _aggregate_dimensions(
+    db: AsyncSession,
+    datatable: DataTable,
+    targets: Sequence[Tuple[str, Optional[Dict[str, Sequence[str]]]]],
+    order: str = "desc",
+    limit: Optional[int] = None,
+) -> List[Tuple[List[AggregateItem], float, float]]:
+    """Aggregate several (dimension, filters) targets in one round-trip.
+
+    Each target becomes one branch of a UNION ALL; ``limit`` applies per target.
+    """
+    codes = [dimension_code.upper() for dimension_code, _ in targets]
+    dimensions = {
+        dimension.code: dimension
+        for dimension in (
+            await db.scalars(
+                select(Dimension)
+                .options(raiseload("*"))
+                .where(
+                    Dimension.data_table_id == datatable.id,
+                    Dimension.code.in_(set(codes)),
+                )
+            )
+        ).all()
+    }
+    for dimension_code in codes:
+        if dimension_code not in dimensions:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Dimension '{dimension_code}' not available.",
+            )
+
+    queries = [
+        _aggregate_query(
+            datatable,
+            dimensions[dimension_code],
+            _normalise_filter_values(filters),
+            branch=index,
+        )
+        for index, (dimension_code, (_, filters)) in enumerate(zip(codes, targets))
+    ]
+
+    aggregated = (queries[0] if len(queries) == 1 else union_all(*queries)).subquery()
+    descending = order.lower() != "asc"
+    agg_value = func.coalesce(aggregated.c.value, 0.0)
+    rank = func.row_number().over(
+        partition_by=aggregated.c.branch,
+        order_by=agg_value.desc() if descending else agg_value.asc(),
     )
-    total_row_value = next(
-        (
-            float(row.value or 0.0)
-            for row in rows
-            if row.category_code in TOTAL_CATEGORY_CODES
-        ),
+    ranked = select(aggregated, rank.label("rank")).subquery()
+    limited = select(ranked)
+    if limit:
+        limited = limited.where(ranked.c.rank <= limit)
+    limited = limited.subquery()
+
+    # Shares are computed over the (limited) rows of each branch, in SQL.
+    value = func.coalesce(limited.c.value, 0.0)
+    is_total = limited.c.category_code.in_(sorted(TOTAL_CATEGORY_CODES))
+    non_total_sum = func.sum(case((is_total, 0.0), else_=value)).over(
+        partition_by=limited.c.branch
+    )
+    # The first total row in result order: the largest when descending.
+    pick_total = func.max if descending else func.min
+    total_row_value = func.coalesce(
+        pick_total(case((is_total, value))).over(partition_by=limited.c.branch),
         0.0,
     )
-    reference_total = non_total_sum if non_total_sum else total_row_value
+    reference_total = case((non_total_sum != 0, non_total_sum), else_=total_row_value)
+    share = case(
+        (is_total, case((value != 0, 100.0), else_=0.0)),
+        (reference_total != 0, func.round(value / reference_total * 100, 2)),
+        else_=None,
+    )
+    query = select(
+        limited.c.branch,
+        limited.c.category_code,
+        limited.c.category_label,
+        limited.c.category_name,
+        value.label("value"),
+        share.label("share"),
+        reference_total.label("reference_total"),
+        total_row_value.label("total_row_value"),
+    ).order_by(limited.c.branch, limited.c.rank)
+
+    rows_by_branch: List[list] = [[] for _ in queries]
+    for row in (await db.execute(query)).all():
+        rows_by_branch[row.branch].append(row)
+    return [_aggregate_items(rows) for rows in rows_by_branch]
+
+
+async def _aggregate_dimension(
+    db: AsyncSession,
+    datatable: DataTable,
+    dimension_code: str,
+    filters: Optional[Dict[str, Sequence[str]]] = None,
+    order: str = "desc",
+    limit: Optional[int] = None,
+) -> Tuple[List[AggregateItem], float, float]:
+    (result,) = await _aggregate_dimensions(
+        db,
+        datatable,
+        [(dimension_code, filters)],
+        order=order,
+        limit=limit,
+    )
+    return result
 
-    results: List[AggregateItem] = []
-    for row in rows:
-        value = float(row.value or 0.0)
-        if row.category_code in TOTAL_CATEGORY_CODES:
-            share = 100.0 if value else 0.0
-        elif reference_total:
-            share = round((value / reference_total) * 100, 2)
-        else:
-            share = None
-        label = row.category_label or row.category_name or row.category_code
-        results.append(
-            AggregateItem(
-                category_code=row.category_code,
-                category_label=label,
-                value=value,
-                share=share,
-            )
-        )
 
-    return results, reference_total, total_row_value
+# Query parameters of /aggregates that are not dimension filters.
+_RESERVED_AGGREGATE_PARAMS = frozenset({"DIMENSION", "LIMIT", "ORDER"})
 
 
 @app.get(
@@ -455,26 +752,26 @@ def _aggregate_dimension(
     response_model=AggregateResponse,
     tags=["observations"],
 )
-def aggregate_dataset(
+async def aggregate_dataset(
     dataset_code: str,
     request: Request,
     dimension: str = Query(..., min_length=1),
     limit: Optional[int] = Query(None, gt=0, le=500),
     order: str = Query("desc", pattern="^(?i)(asc|desc)$"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> AggregateResponse:
-    dataset_code = unquote(dataset_code)
-    datatable = _get_datatable_by_code(db, dataset_code)
+    datatable = await _get_datatable_by_code(db, dataset_code)
     dimension_code = dimension.upper()
 
     raw_filters: Dict[str, List[str]] = {}
+    reserved = _RESERVED_AGGREGATE_PARAMS
     for key, value in request.query_params.multi_items():
         key_upper = key.upper()
-        if key_upper in {"DIMENSION", "LIMIT", "ORDER"}:
+        if key_upper in reserved:
             continue
         raw_filters.setdefault(key_upper, []).append(value)
 
-    results, _, _ = _aggregate_dimension(
+    results, _, _ = await _aggregate_dimension(
         db,
         datatable,
         dimension_code,
@@ -491,25 +788,42 @@ def aggregate_dataset(
     )
 
 
+# One pass over the age-code grammar: YLT<n>, YGE<n>, Y<low>T<high> and Y<n>.
+_AGE_CODE_RE = re.compile(
+    r"Y(?:LT\D*(?P<lt>\d+)?.*|GE\D*(?P<ge>\d+)?.*|(?P<low>\d+)T(?P<high>\d+)|(?P<age>\d+))",
+    re.DOTALL,
+)
+
+
+def _parse_age_bounds(code: str) -> Tuple[Optional[int], Optional[int]]:
+    match = _AGE_CODE_RE.fullmatch(code) if code else None
+    if match is None:
+        return None, None
+    lt, ge, low, high, age = match.group("lt", "ge", "low", "high", "age")
+    if age is not None:
+        return int(age), int(age)
+    if low is not None:
+        return int(low), int(high)
+    if code.startswith("YLT"):
+        return None, int(lt) if lt else None
+    return int(ge) if ge else None, None
+
+
 @app.get(
     "/datasets/{dataset_code}/insights/ageing",
     response_model=AgeingInsights,
     tags=["insights"],
 )
-def ageing_insights(
+async def ageing_insights(
     dataset_code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> AgeingInsights:
-    dataset_code = unquote(dataset_code)
-    datatable = _get_datatable_by_code(db, dataset_code)
+    # Dimensions and categories are only needed on a default-totals cache miss,
+    # where _compute_default_totals loads them in one query; never lazily here.
+    datatable = await _get_datatable_by_code(db, dataset_code)
 
-    latest_period = (
-        db.query(Observation.time_period)
-        .filter(Observation.data_table_id == datatable.id)
-        .filter(Observation.time_period.isnot(None))
-        .order_by(Observation.time_period.desc())
-        .limit(1)
-        .scalar()
+    latest_period = await db.scalar(
+        _SELECT_LATEST_PERIOD, {"datatable_id": datatable.id}
     )
     if latest_period is None:
         raise HTTPException(
@@ -524,7 +838,7 @@ def ageing_insights(
         "FREQ": ["A10"],
     }
 
-    default_totals = _default_total_filters(datatable)
+    default_totals = await _default_total_filters(db, datatable)
 
     def with_default_totals(
         filters: Dict[str, Sequence[str]],
@@ -549,7 +863,7 @@ def ageing_insights(
 
     age_filters = with_default_totals(base_filters, skip=("AGE",))
 
-    age_results, _, total_value = _aggregate_dimension(
+    age_results, _, total_value = await _aggregate_dimension(
         db,
         datatable,
         "AGE",
@@ -581,29 +895,10 @@ def ageing_insights(
             )
         )
 
-    def parse_age_bounds(code: str) -> Tuple[Optional[int], Optional[int]]:
-        if not code or not code.startswith("Y"):
-            return None, None
-        body = code[1:]
-        if body.startswith("LT"):
-            match = re.search(r"\d+", body)
-            return None, int(match.group()) if match else None
-        if body.startswith("GE"):
-            match = re.search(r"\d+", body)
-            return int(match.group()) if match else None, None
-        if "T" in body:
-            low, high = body.split("T", 1)
-            if low.isdigit() and high.isdigit():
-                return int(low), int(high)
-        if body.isdigit():
-            age = int(body)
-            return age, age
-        return None, None
-
     range_senior_codes: List[Tuple[int, str]] = []
     single_senior_codes: List[Tuple[int, str]] = []
     for code, item in age_lookup.items():
-        lower, upper = parse_age_bounds(code)
+        lower, upper = _parse_age_bounds(code)
         if lower is None and upper is None:
             continue
         if lower is not None and lower >= 65:
@@ -655,7 +950,7 @@ def ageing_insights(
 
     eighty_plus_codes: List[str] = []
     for code in seniors_codes:
-        lower, upper = parse_age_bounds(code)
+        lower, upper = _parse_age_bounds(code)
         bound = lower if lower is not None else upper
         if bound is not None and bound >= 80:
             eighty_plus_codes.append(code)
@@ -682,14 +977,6 @@ def ageing_insights(
         skip=("SEX",),
     )
 
-    seniors_by_sex, _, _ = _aggregate_dimension(
-        db,
-        datatable,
-        "SEX",
-        filters=senior_filters_for_sex,
-        order="desc",
-    )
-
     senior_filters_for_marital = with_default_totals(
         {
             **base_filters,
@@ -699,11 +986,14 @@ def ageing_insights(
         skip=("LMS",),
     )
 
-    seniors_by_marital, _, _ = _aggregate_dimension(
+    # Both senior breakdowns depend on the AGE result, so they share one query.
+    (seniors_by_sex, _, _), (seniors_by_marital, _, _) = await _aggregate_dimensions(
         db,
         datatable,
-        "LMS",
-        filters=senior_filters_for_marital,
+        [
+            ("SEX", senior_filters_for_sex),
+            ("LMS", senior_filters_for_marital),
+        ],
         order="desc",
     )
 
@@ -724,19 +1014,44 @@ def ageing_insights(
         senior_age_codes=seniors_codes,
     )
 
-__all__ = ["app"]
+__all__ = ["app", "run_server"]
 
-if __name__ == "__main__":
-    import json
+
+def run_server() -> None:
+    """Create any missing tables, then serve the API with uvicorn (blocks)."""
+    import importlib.util
     import os
     import uvicorn
 
-    openapi_schema = app.openapi()
-    output_dir = os.path.join(os.getcwd(), "output_backend")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "openapi_specs.json")
-    print(f"Writing OpenAPI schema to {output_file}")
+    # Create any missing tables once here, before the workers fork.
+    init_db()
     print("Swagger UI available at http://0.0.0.0:8000/docs")
-    with open(output_file, "w", encoding="utf-8") as file:
-        json.dump(openapi_schema, file, indent=2)
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Ask for uvloop and httptools outright, falling back to the pure-Python loop
+    # and parser where they are not installed (e.g. uvloop on Windows).
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    # One process by default: the async pool already overlaps requests, and each
+    # extra worker holds its own connections and caches. API_WORKERS opts in to
+    # more (WAL lets them share the file; the pool is split between them).
+    workers = int(os.environ.get("API_WORKERS", "1"))
+    target: object = app
+    if workers > 1:
+        # Worker processes import the app themselves, so they need it as an import
+        # string naming this module however it was loaded (script, -m or package).
+        module = __spec__.name if __spec__ is not None else Path(__file__).stem
+        target = f"{module}:app"
+    uvicorn.run(target, host="0.0.0.0", port=8000, workers=workers, loop=loop, http=http)
+
+
+if __name__ == "__main__":
+    import os
+
+    # Building the schema walks every route and model; only do it on request.
+    if os.environ.get("DUMP_OPENAPI"):
+        output_dir = os.path.join(os.getcwd(), "output_backend")
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, "openapi_specs.json")
+        print(f"Writing OpenAPI schema to {output_file}")
+        with open(output_file, "wb") as file:
+            file.write(orjson.dumps(app.openapi(), option=orjson.OPT_INDENT_2))
+    run_server()
@@ -54,6 +54,11 @@ class ObservationPoint(BaseModel):
     dimensions: Dict[str, str]
 
 
+class ObservationPage(BaseModel):
+    items: List[ObservationPoint]
+    next_cursor: Optional[int] = None
+
+
 class AggregateItem(BaseModel):
     category_code: str
     category_label: str
@@ -83,3 +88,17 @@ class AgeingInsights(BaseModel):
     seniors_by_sex: List[AggregateItem]
     seniors_by_marital_status: List[AggregateItem]
     senior_age_codes: List[str]
+
+
+__all__ = [
+    "AgeingInsights",
+    "AggregateItem",
+    "AggregateResponse",
+    "CategoryRead",
+    "DataTableDetail",
+    "DataTableSummary",
+    "DimensionDetail",
+    "DimensionSummary",
+    "ObservationPage",
+    "ObservationPoint",
+]
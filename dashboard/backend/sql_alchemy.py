@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -8,13 +9,19 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
     create_engine,
+    event,
     func,
+    inspect,
 )
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateColumn
 
 
 class Base(DeclarativeBase):
@@ -38,15 +45,20 @@ class DataTable(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # Incremented by every ingest of the dataset; the API keys its caches on it
+    # because updated_at only resolves to whole seconds on SQLite.
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
 
     dimensions: Mapped[List["Dimension"]] = relationship(
         back_populates="data_table", cascade="all, delete-orphan"
     )
+    # Per-dataset collections run to thousands (observations to millions) of rows;
+    # raise instead of lazy loading so callers must pick an eager strategy.
     categories: Mapped[List["Category"]] = relationship(
-        back_populates="data_table", cascade="all, delete-orphan"
+        back_populates="data_table", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
     observations: Mapped[List["Observation"]] = relationship(
-        back_populates="data_table", cascade="all, delete-orphan"
+        back_populates="data_table", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
 
 
@@ -69,7 +81,7 @@ class Dimension(Base):
         back_populates="dimension", cascade="all, delete-orphan"
     )
     observation_values: Mapped[List["ObservationDimensionValue"]] = relationship(
-        back_populates="dimension", cascade="all, delete-orphan"
+        back_populates="dimension", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
 
 
@@ -83,9 +95,11 @@ class Category(Base):
     code: Mapped[str] = mapped_column(String(100))
     name: Mapped[str] = mapped_column(String(200))
     label: Mapped[Optional[str]] = mapped_column(String(512))
-    data_table_id: Mapped[int] = mapped_column(ForeignKey("datatable.id"), nullable=False)
+    data_table_id: Mapped[int] = mapped_column(
+        ForeignKey("datatable.id"), nullable=False, index=True
+    )
     dimension_id: Mapped[int] = mapped_column(ForeignKey("dimension.id"), nullable=False)
-    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey("category.id"))
+    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey("category.id"), index=True)
 
     data_table: Mapped["DataTable"] = relationship(back_populates="categories")
     dimension: Mapped["Dimension"] = relationship(back_populates="categories")
@@ -98,12 +112,17 @@ class Category(Base):
         cascade="all, delete-orphan",
     )
     observation_values: Mapped[List["ObservationDimensionValue"]] = relationship(
-        back_populates="category", cascade="all, delete-orphan"
+        back_populates="category", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
 
 
 class Observation(Base):
     __tablename__ = "observation"
+    __table_args__ = (
+        # Paging by id and the latest-period lookup are both scoped to one dataset.
+        Index("ix_obs_dt_id", "data_table_id", "id"),
+        Index("ix_obs_dt_tp", "data_table_id", "time_period"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     value: Mapped[float] = mapped_column(Float, nullable=False)
@@ -118,7 +137,7 @@ class Observation(Base):
 
     data_table: Mapped["DataTable"] = relationship(back_populates="observations")
     dimension_values: Mapped[List["ObservationDimensionValue"]] = relationship(
-        back_populates="observation", cascade="all, delete-orphan"
+        back_populates="observation", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
 
 
@@ -126,6 +145,8 @@ class ObservationDimensionValue(Base):
     __tablename__ = "observation_dimension_value"
     __table_args__ = (
         UniqueConstraint("observation_id", "dimension_id", name="uq_obs_dim"),
+        # Aggregates scan one dimension's links and join on their category.
+        Index("ix_odv_dim_cat", "dimension_id", "category_id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -133,22 +154,123 @@ class ObservationDimensionValue(Base):
         ForeignKey("observation.id", ondelete="CASCADE"), nullable=False
     )
     dimension_id: Mapped[int] = mapped_column(ForeignKey("dimension.id"), nullable=False)
-    category_id: Mapped[int] = mapped_column(ForeignKey("category.id"), nullable=False)
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("category.id"), nullable=False, index=True
+    )
 
     observation: Mapped["Observation"] = relationship(back_populates="dimension_values")
     dimension: Mapped["Dimension"] = relationship(back_populates="observation_values")
     category: Mapped["Category"] = relationship(back_populates="observation_values")
 
 
+class IngestCheckpoint(Base):
+    """Hash of the last payload ingested for a dataset, used to skip unchanged re-runs."""
+
+    __tablename__ = "ingest_checkpoint"
+
+    dataset_code: Mapped[str] = mapped_column(String(120), primary_key=True)
+    payload_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    ingested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
 DATABASE_PATH = Path(__file__).resolve().parent / "Class_Diagram.db"
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+# Stored in PRAGMA user_version once init_db has created the schema; bump it
+# whenever a table, column or index is added so existing databases are brought up to date.
+SCHEMA_VERSION = 2
+# Room for every statement shape the API and ingest build (aliases, IN-list
+# filters, UNION branches) so compiled SQL is reused rather than evicted.
+QUERY_CACHE_SIZE = 1200
+# Statement logging formats every bind parameter; only turn it on for debugging.
+SQL_ECHO = bool(os.environ.get("SQLA_ECHO"))
+# A small pool keeps warm connections (with their PRAGMAs applied) across the
+# per-dataset sessions opened by the ingest loop.
+INGEST_POOL_SIZE = 4
+engine = create_engine(
+    DATABASE_URL,
+    echo=SQL_ECHO,
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=INGEST_POOL_SIZE,
+    insertmanyvalues_page_size=10_000,
+    query_cache_size=QUERY_CACHE_SIZE,
+)
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
+# Async engine settings for the API, so DB waits do not hold a worker thread.
+# The pool is sized explicitly so bursts of /aggregates and /insights requests queue
+# on spare connections instead of starving on the 5+10 default. These are totals
+# for the whole API; create_api_engine splits them across the API_WORKERS processes,
+# since every aiosqlite connection holds its own thread, page cache and mmap.
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+API_POOL_SIZE = 20
+API_MAX_OVERFLOW = 40
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Use WAL journaling with relaxed syncing so bulk inserts are not fsync-bound.
+
+    A 64 MiB page cache, 256 MiB of memory-mapped I/O and in-memory temp
+    tables keep aggregate scans and their sorts off the syscall path.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def create_api_engine() -> AsyncEngine:
+    """Build the aiosqlite engine the API serves from, with the same PRAGMAs.
+
+    Built by main_api rather than at import, so the ingest and agent processes,
+    which only use the sync engine, do not need aiosqlite installed.
+    """
+    workers = max(1, int(os.environ.get("API_WORKERS", "1")))
+    api_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=SQL_ECHO,
+        pool_size=max(1, API_POOL_SIZE // workers),
+        max_overflow=API_MAX_OVERFLOW // workers,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
+    event.listen(api_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return api_engine
+
 
 def init_db() -> None:
-    """Ensure all tables exist."""
-    Base.metadata.create_all(engine, checkfirst=True)
+    """Ensure all tables and indexes exist.
 
+    Called by each entry point (data_fetch, main_api, the observationchecker
+    export and the agent) rather than at import, so modules that only need the
+    models do not pay a schema check per table. A database
+    already stamped with ``SCHEMA_VERSION`` is trusted after a single PRAGMA read.
+    """
+    with engine.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION:
+            return
+    Base.metadata.create_all(engine, checkfirst=True)
+    # create_all only indexes tables it creates; add indexes missing from older databases.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        # Nor does it alter existing tables; add columns introduced since they were created.
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}")
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
-init_db()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from dashboard.backend.sql_alchemy import (  # noqa: E402
+    Base,
+    Category,
+    DataTable,
+    Dimension,
+    Observation,
+    ObservationDimensionValue,
+)
+
+
+def _add_dataset(session: Session, code: str, dimensions: dict) -> None:
+    """Store one dataset with an observation for every combination of categories."""
+    datatable = DataTable(code=code, name=code.title(), description=None, provider="STATEC")
+    session.add(datatable)
+    categories: List[List[tuple]] = []
+    for position, (dimension_code, category_codes) in enumerate(dimensions.items()):
+        dimension = Dimension(
+            code=dimension_code,
+            name=dimension_code.lower(),
+            label=dimension_code.lower(),
+            position=position,
+            data_table=datatable,
+        )
+        total = Category(code="_T", name="Total", data_table=datatable, dimension=dimension)
+        children = [
+            Category(code=category_code, name=category_code.lower(), data_table=datatable,
+                     dimension=dimension, parent=total)
+            for category_code in category_codes
+        ]
+        categories.append([(dimension, category) for category in [total, *children]])
+
+    combinations: List[List[tuple]] = [[]]
+    for options in categories:
+        combinations = [combination + [option] for combination in combinations for option in options]
+    for index, combination in enumerate(combinations):
+        observation = Observation(value=float(index), time_period="2021", data_table=datatable)
+        for dimension, category in combination:
+            session.add(
+                ObservationDimensionValue(
+                    observation=observation, dimension=dimension, category=category
+                )
+            )
+
+
+@pytest.fixture
+def sync_engine(tmp_path: Path) -> Iterator[Engine]:
+    """A throwaway SQLite database holding a one-dimension and a three-dimension dataset."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        _add_dataset(session, "SMALL", {"SEX": ["F", "M"]})
+        _add_dataset(
+            session,
+            "LARGE",
+            {"AGE": ["Y_LT15", "Y15T64", "Y_GE65"], "SEX": ["F", "M"], "RESIDENCE": ["LU", "FOR"]},
+        )
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[List[str]]:
+    """Collect every statement ``engine`` sends to the database inside the block."""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def statement_counter():
+    return count_statements
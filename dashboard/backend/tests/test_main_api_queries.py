@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from dashboard.backend import main_api
+
+# Statements per request, whatever the dataset's size: growing with the number of
+# dimensions, categories or observations would mean a query per row crept back in.
+EXPECTED_STATEMENTS = {
+    "/datasets/{code}": 3,
+    "/datasets/{code}/dimensions/SEX": 3,
+    "/datasets/{code}/observations?limit=1000": 2,
+}
+
+
+@pytest.fixture
+def api(sync_engine, tmp_path: Path):
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool
+    )
+    session_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def get_test_db() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as session:
+            yield session
+
+    main_api.app.dependency_overrides[main_api.get_db] = get_test_db
+    try:
+        with TestClient(main_api.app) as client:
+            yield client, async_engine.sync_engine
+    finally:
+        main_api.app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", sorted(EXPECTED_STATEMENTS))
+def test_statement_count_does_not_grow_with_dataset(api, statement_counter, path):
+    client, engine = api
+    for code in ("SMALL", "LARGE"):
+        # A cached response would hide the queries being counted.
+        main_api._VERSIONED_CACHE.clear()
+        with statement_counter(engine) as statements:
+            response = client.get(path.format(code=code))
+        assert response.status_code == 200, response.text
+        assert len(statements) == EXPECTED_STATEMENTS[path], (code, statements)
+
+
+def test_datatable_lookup_raises_on_relationship_access(sync_engine):
+    with Session(sync_engine) as session:
+        datatable = session.execute(
+            main_api._SELECT_DATATABLE_BY_CODE, {"dataset_code": "LARGE"}
+        ).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            datatable.dimensions
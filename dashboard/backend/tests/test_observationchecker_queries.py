@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, sessionmaker
+
+from dashboard.backend.database import observationchecker
+from dashboard.backend.sql_alchemy import Category, DataTable, Dimension, Observation
+
+# The observation with its dataset, then its dimension values with their dimension,
+# category and parent category, whatever the number of dimensions.
+EXPECTED_EXPLAIN_STATEMENTS = 2
+
+
+def test_explain_observation_statement_count(sync_engine, statement_counter, monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(
+        observationchecker, "SessionLocal", sessionmaker(bind=sync_engine, expire_on_commit=False)
+    )
+    with Session(sync_engine) as session:
+        observation_ids = {
+            code: session.scalars(
+                select(Observation.id)
+                .join(DataTable)
+                .where(DataTable.code == code)
+                .order_by(Observation.id.desc())
+                .limit(1)
+            ).one()
+            for code in ("SMALL", "LARGE")
+        }
+
+    for code, observation_id in observation_ids.items():
+        with statement_counter(sync_engine) as statements:
+            data = observationchecker.explain_observation_to_json(
+                observation_id, output_file=str(tmp_path / f"{code}.json")
+            )
+        assert data["dataset"]["code"] == code
+        assert all(item["category"]["parent"] for item in data["dimensions"])
+        assert len(statements) == EXPECTED_EXPLAIN_STATEMENTS, (code, statements)
+
+
+@pytest.mark.parametrize(
+    "model, collection",
+    [
+        (DataTable, "categories"),
+        (DataTable, "observations"),
+        (Dimension, "observation_values"),
+        (Category, "observation_values"),
+        (Observation, "dimension_values"),
+    ],
+)
+def test_unloaded_collection_raises(sync_engine, model, collection):
+    with Session(sync_engine) as session:
+        instance = session.scalars(select(model).limit(1)).one()
+        with pytest.raises(InvalidRequestError):
+            getattr(instance, collection)
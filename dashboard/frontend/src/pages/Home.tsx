@@ -96,6 +96,11 @@ type ObservationPoint = {
   dimensions: Record<string, string>;
 };
 
+type ObservationPage = {
+  items: ObservationPoint[];
+  next_cursor?: number | null;
+};
+
 type AssistantSelectionStatus = "pending" | "applied" | "unavailable";
 
 interface AssistantSelectionIndicator {
@@ -1283,11 +1288,11 @@ const Home: React.FC = () => {
           });
         });
 
-        const response = await axios.get<ObservationPoint[]>(
+        const response = await axios.get<ObservationPage>(
           `${API_BASE}/datasets/${selectedDataset}/observations`,
           { params }
         );
-      setObservations(response.data);
+      setObservations(response.data.items);
     } catch (error) {
       console.error(error);
       setObsError("Unable to fetch observations sample.");
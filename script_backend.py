@@ -2,14 +2,16 @@
 Backend Automation Script
 This script performs the following steps:
 1. Installs required dependencies from requirements.txt
-2. Initializes the database (via sql_alchemy import)
+2. Initializes the database (data_fetch.py runs init_db before fetching)
 3. Fetches and populates data from SDMX sources
-4. Launches the FastAPI application
+4. Launches the FastAPI application in-process
 """
 import os
+import re
 import sys
 import subprocess
 import time
+from importlib import metadata
 
 
 def run_command(command, description, shell=True):
@@ -35,6 +37,49 @@ def run_command(command, description, shell=True):
         return False
 
 
+def _installed(name):
+    """Return the installed version of a distribution, or None if it is missing."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _extra_dependencies(name, extra):
+    """Yield the names of the distributions that ``name[extra]`` pulls in."""
+    extra_marker = re.compile(r"""extra\s*==\s*["']%s["']""" % re.escape(extra), re.IGNORECASE)
+    for requirement in metadata.requires(name) or []:
+        dependency, _, marker = requirement.partition(";")
+        if extra_marker.search(marker):
+            yield re.match(r"[A-Za-z0-9._-]+", dependency.strip()).group(0)
+
+
+def requirements_satisfied(requirements_file):
+    """Return True if every requirement is already installed at a matching version.
+
+    Only bare names, ``[extras]`` and ``==`` pins are understood; anything else
+    returns False so pip makes the call. An extra counts as installed when every
+    distribution it lists is present; platform markers are not evaluated, so a
+    dependency excluded on this platform just means pip runs.
+    """
+    with open(requirements_file) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            match = re.fullmatch(r"([A-Za-z0-9._-]+)(?:\[([^\]]*)\])?\s*(?:==\s*(\S+))?", line)
+            if match is None:
+                return False
+            name, extras, pinned = match.groups()
+            installed = _installed(name)
+            if installed is None or (pinned is not None and installed != pinned):
+                return False
+            for extra in filter(None, (e.strip() for e in (extras or "").split(","))):
+                if any(_installed(dep) is None for dep in _extra_dependencies(name, extra)):
+                    return False
+    return True
+
+
 def main():
     """Main execution flow."""
     print("\n" + "="*60)
@@ -50,15 +95,17 @@ def main():
         print(f"✗ Error: requirements.txt not found at {requirements_file}")
         sys.exit(1)
     
-    # Step 1: Install requirements
-    install_cmd = f"pip install -r {requirements_file}"
-    if not run_command(install_cmd, "Installing requirements"):
+    # Step 1: Install requirements (skipped when every pin is already installed)
+    install_cmd = [sys.executable, "-m", "pip", "install", "-r", requirements_file]
+    if requirements_satisfied(requirements_file):
+        print("\n✓ Requirements already satisfied, skipping pip install")
+    elif not run_command(install_cmd, "Installing requirements", shell=False):
         print("\n⚠ Failed to install requirements. Please check the error above.")
         response = input("Do you want to continue anyway? (y/n): ")
         if response.lower() != 'y':
             sys.exit(1)
     
-    # Step 2: Initialize database (happens automatically via sql_alchemy import)
+    # Step 2: Initialize database (data_fetch.py creates any missing tables on start)
     print(f"\n{'='*60}")
     print("STEP: Initializing Database")
     print(f"{'='*60}")
@@ -97,24 +144,23 @@ def main():
     print("Now do npm install inside the dashboard/frontend directory to install frontend dependencies.\n")
     print("Then run the frontend with 'npm start' inside the dashboard/frontend directory.\n")
     
-    # Change to backend directory and run the API
-    os.chdir(backend_dir)
-    
+    # Serve the API from this process; the backend directory only needs to be
+    # importable, which also lets uvicorn's worker processes find main_api.
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+
     try:
+        from main_api import run_server
+
         # Run the API (this will block until CTRL+C)
-        api_cmd = "python main_api.py"
-        subprocess.run(api_cmd, shell=True, check=True)
+        run_server()
     except KeyboardInterrupt:
         print("\n\n" + "="*60)
         print("Server stopped by user")
         print("="*60)
     except Exception as e:
         print(f"\n✗ Error launching API: {e}")
-        os.chdir(original_dir)
         sys.exit(1)
-    finally:
-        os.chdir(original_dir)
-
 
 if __name__ == "__main__":
     main()